@@ -7,9 +7,15 @@ GUVI HCL Hackathon 2026
 
 import streamlit as st
 import os
+import io
 import sys
 import time
+import threading
+import hashlib
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from operator import attrgetter
 from pathlib import Path
 
 # Add project root to path
@@ -17,22 +23,16 @@ sys.path.insert(0, str(Path(__file__).parent))
 
 # Import core modules
 from core.document_loader import DocumentLoader
-from core.nlp_pipeline import NLPPipeline
 from core.clause_extractor import ClauseExtractor
 from core.risk_assessor import RiskAssessor, RiskLevel
 from core.contract_classifier import ContractClassifier
 
-# Import LLM modules
-from llm.legal_analyzer import LegalAnalyzer, FallbackAnalyzer
-from llm.prompts import PromptTemplates
-
 # Import utility modules
 from utils.hindi_processor import HindiProcessor
 from utils.audit_logger import AuditLogger
 
 # Import UI modules
 from ui.components import UIComponents
-from ui.pdf_exporter import PDFExporter
 
 # Page configuration
 st.set_page_config(
@@ -43,7 +43,7 @@ st.set_page_config(
 )
 
 # Custom CSS
-st.markdown("""
+_CSS = """
 <style>
     .main-header {
         background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
@@ -91,7 +91,159 @@ st.markdown("""
         border-radius: 4px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+_HEADER_HTML = """
+<div class="main-header">
+    <h1>📄 Contract Analysis & Risk Assessment Bot</h1>
+    <p>GenAI-powered Legal Assistant for Indian SMEs | GUVI HCL Hackathon 2026</p>
+</div>
+"""
+
+_WELCOME_HTML = """
+<div style="
+    background: #f8f9fa;
+    border-radius: 10px;
+    padding: 2rem;
+    text-align: center;
+    margin: 2rem 0;
+">
+    <h2>👋 Welcome to Contract Analysis Bot</h2>
+    <p>Upload a contract document to get started with AI-powered analysis.</p>
+    <br>
+    <h4>What this tool does:</h4>
+    <div style="display: flex; justify-content: space-around; flex-wrap: wrap; gap: 1rem; margin-top: 1rem;">
+        <div style="flex: 1; min-width: 200px;">
+            <h3>📋</h3>
+            <p><strong>Classify</strong><br>Identify contract type</p>
+        </div>
+        <div style="flex: 1; min-width: 200px;">
+            <h3>⚠️</h3>
+            <p><strong>Assess Risk</strong><br>Find risky clauses</p>
+        </div>
+        <div style="flex: 1; min-width: 200px;">
+            <h3>🧠</h3>
+            <p><strong>Explain</strong><br>Plain language summaries</p>
+        </div>
+        <div style="flex: 1; min-width: 200px;">
+            <h3>💡</h3>
+            <p><strong>Suggest</strong><br>Negotiation alternatives</p>
+        </div>
+    </div>
+</div>
+"""
+
+_FOOTER_HTML = """
+<div style="text-align: center; color: #888; font-size: 0.8rem;">
+    <p>Contract Analysis & Risk Assessment Bot | GUVI HCL Hackathon 2026</p>
+    <p>⚠️ This tool provides AI-powered analysis and does not constitute legal advice.</p>
+</div>
+"""
+
+
+# Tab renderers run as fragments so their widgets only rerun the tab;
+# st.fragment is st.experimental_fragment before Streamlit 1.37
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda func: func)
+
+# Clause fields passed to the risk assessor and to the PDF export
+_CLAUSE_FIELDS = ('clause_id', 'title', 'content', 'category', 'risk_indicators')
+_get_clause_fields = attrgetter(*_CLAUSE_FIELDS)
+
+_EXPORT_CLAUSE_FIELDS = ('clause_id', 'title', 'category', 'content')
+_get_export_clause_fields = attrgetter(*_EXPORT_CLAUSE_FIELDS)
+
+
+@st.cache_resource
+def get_document_loader():
+    """Shared DocumentLoader instance (cached across reruns)"""
+    return DocumentLoader()
+
+
+@st.cache_resource
+def _start_warmup():
+    """
+    Import and build the NLP pipeline in a background thread, once per process,
+    so the spaCy load overlaps with the first render instead of blocking it
+    """
+    warmup = {"pipeline": None}
+    
+    def _warm_imports():
+        from core.nlp_pipeline import NLPPipeline
+        warmup["pipeline"] = NLPPipeline()
+    
+    warmup["thread"] = threading.Thread(target=_warm_imports, name="nlp-warmup", daemon=True)
+    warmup["thread"].start()
+    return warmup
+
+
+@st.cache_resource
+def get_nlp_pipeline():
+    """Shared NLPPipeline instance; reuses the one built by the warm-up thread"""
+    warmup = _start_warmup()
+    warmup["thread"].join()
+    if warmup["pipeline"] is not None:
+        return warmup["pipeline"]
+    
+    # Warm-up failed; build it here so any error surfaces to the caller
+    from core.nlp_pipeline import NLPPipeline
+    return NLPPipeline()
+
+
+@st.cache_resource
+def get_clause_extractor():
+    """Shared ClauseExtractor instance (cached across reruns)"""
+    return ClauseExtractor()
+
+
+@st.cache_resource
+def get_risk_assessor():
+    """Shared RiskAssessor instance (cached across reruns)"""
+    return RiskAssessor()
+
+
+@st.cache_resource
+def get_contract_classifier():
+    """Shared ContractClassifier instance (cached across reruns)"""
+    return ContractClassifier()
+
+
+@st.cache_resource
+def get_hindi_processor():
+    """Shared HindiProcessor instance (cached across reruns)"""
+    return HindiProcessor()
+
+
+def _get_legal_analyzer():
+    """Import LegalAnalyzer (and the openai SDK) only when an LLM feature is used"""
+    from llm.legal_analyzer import LegalAnalyzer
+    return LegalAnalyzer
+
+
+def _stream_markdown(placeholder):
+    """
+    Build an on_delta callback that renders a streamed LLM response
+    
+    Each update resends the text so far, so the placeholder is refreshed at
+    most every 0.1s; the caller renders the complete response at the end.
+    """
+    parts = []
+    last_render = 0.0
+    
+    def on_delta(delta: str):
+        nonlocal last_render
+        parts.append(delta)
+        now = time.monotonic()
+        if now - last_render >= 0.1:
+            last_render = now
+            placeholder.markdown("".join(parts))
+    
+    return on_delta
+
+
+def _get_pdf_exporter():
+    """Import PDFExporter (and fpdf2) only when a PDF report is requested"""
+    from ui.pdf_exporter import PDFExporter
+    return PDFExporter
 
 
 def initialize_session_state():
@@ -115,13 +267,10 @@ def initialize_session_state():
 
 
 def render_header():
-    """Render the main header"""
-    st.markdown("""
-    <div class="main-header">
-        <h1>📄 Contract Analysis & Risk Assessment Bot</h1>
-        <p>GenAI-powered Legal Assistant for Indian SMEs | GUVI HCL Hackathon 2026</p>
-    </div>
-    """, unsafe_allow_html=True)
+    """Render the custom CSS and main header"""
+    # Streamlit drops elements that are not re-emitted on a rerun, so the
+    # styles go out with the header in one element every run
+    st.markdown(_CSS + _HEADER_HTML, unsafe_allow_html=True)
 
 
 def render_sidebar():
@@ -171,6 +320,10 @@ def render_sidebar():
             help="Minimum score to highlight as risk"
         )
         
+        if st.button("🗑️ Clear Cached Analyses", help="Forget stored results, e.g. after uploading a revised contract"):
+            _analyze.clear()
+            st.success("Cached analyses cleared")
+        
         st.markdown("---")
         
         # File format info
@@ -203,30 +356,131 @@ def render_sidebar():
         }
 
 
+def _build_clause_index(clauses) -> dict:
+    """
+    Build the lookup structures used by the clause search/filter UI
+    
+    Returns:
+        Dict with 'search' (lower-cased (title, content) per clause) and
+        'by_category' (category -> clause indices, in document order)
+    """
+    by_category = defaultdict(list)
+    for i, clause in enumerate(clauses):
+        by_category[clause.category].append(i)
+    
+    return {
+        'search': [(c.title.lower(), c.content.lower()) for c in clauses],
+        'by_category': dict(by_category)
+    }
+
+
+# Analyses are kept in memory for an hour by default. Set
+# ANALYSIS_CACHE_PERSIST=disk to also keep them across app restarts; that
+# pickles every uploaded contract's text and analysis, unencrypted, into
+# Streamlit's cache directory, where they stay (Streamlit ignores ttl and
+# max_entries for persisted files) until "Clear Cached Analyses" is used.
+_ANALYSIS_CACHE_OPTIONS = (
+    {"persist": "disk"} if os.getenv("ANALYSIS_CACHE_PERSIST", "none") == "disk"
+    else {"ttl": 3600}
+)
+
+
+# max_entries bounds the in-memory cache, so a long-running server does not
+# hold every contract ever uploaded in memory
+@st.cache_data(show_spinner=False, max_entries=32, **_ANALYSIS_CACHE_OPTIONS)
+def _analyze(file_bytes: bytes, filename: str, detect_hindi: bool) -> dict:
+    """
+    Run the pure-compute part of the pipeline (load, language, classify,
+    clauses, NLP, risk). Cached on the uploaded bytes and settings, so
+    re-analysing the same contract returns the stored results instantly.
+    
+    Returns:
+        Dict with 'source_text' and 'metadata', plus the analysis results
+        when enough text could be extracted
+    """
+    doc_loader = get_document_loader()
+    nlp_pipeline = get_nlp_pipeline()
+    clause_extractor = get_clause_extractor()
+    risk_assessor = get_risk_assessor()
+    classifier = get_contract_classifier()
+    hindi_processor = get_hindi_processor()
+    
+    # Load document
+    text, metadata = doc_loader.load_from_stream(io.BytesIO(file_bytes), filename)
+    analysis = {'source_text': text, 'metadata': metadata}
+    
+    if not text or len(text.strip()) < 100:
+        return analysis
+    
+    # Language processing; the loader has already detected the language
+    if detect_hindi and metadata.get('language') in ('hi', 'mixed'):
+        text = hindi_processor.prepare_for_nlp(text)
+        metadata['original_language'] = 'hindi'
+    
+    # Lower-case once for the case-insensitive keyword scans
+    text_lower = text.lower()
+    
+    # Classification, clause extraction and NLP only read the text,
+    # so run them side by side
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        classification_future = executor.submit(classifier.classify, text, text_lower)
+        clauses_future = executor.submit(clause_extractor.extract_clauses, text)
+        dimensions_future = executor.submit(clause_extractor.extract_data_dimensions, text)
+        nlp_future = executor.submit(nlp_pipeline.process, text)
+        
+        classification = classification_future.result()
+        clauses = clauses_future.result()
+        data_dimensions = dimensions_future.result()
+        nlp_results = nlp_future.result()
+    
+    # Risk Assessment
+    clause_dicts = [dict(zip(_CLAUSE_FIELDS, _get_clause_fields(c))) for c in clauses]
+    
+    risk_report = risk_assessor.assess_contract(text, clause_dicts, text_lower=text_lower)
+    
+    analysis.update({
+        'text': text,
+        'classification': classification,
+        'clauses': clauses,
+        'clause_dicts': clause_dicts,
+        'clause_index': _build_clause_index(clauses),
+        'data_dimensions': data_dimensions,
+        'nlp_results': nlp_results,
+        'risk_report': risk_report
+    })
+    return analysis
+
+
 def process_document(uploaded_file, settings):
     """Process uploaded document and perform analysis"""
     
-    # Initialize components
-    doc_loader = DocumentLoader()
-    nlp_pipeline = NLPPipeline()
-    clause_extractor = ClauseExtractor()
-    risk_assessor = RiskAssessor()
-    classifier = ContractClassifier()
-    hindi_processor = HindiProcessor()
-    
     # Create progress indicators
     progress_bar = st.progress(0)
     status_text = st.empty()
+    last_push = 0.0
+    
+    def _tick(pct, msg=None):
+        """Push a progress update, skipping ones within 150 ms of the last push"""
+        nonlocal last_push
+        now = time.monotonic()
+        if now - last_push > 0.15 or pct == 100:
+            progress_bar.progress(pct)
+            if msg:
+                status_text.text(msg)
+            last_push = now
     
     try:
-        # Step 1: Load document
-        status_text.text("📄 Loading document...")
-        progress_bar.progress(10)
+        # Step 1: Load and analyse document (cached per file content)
+        _tick(10, "📄 Loading and analyzing document...")
         
-        file_bytes = uploaded_file.read()
-        text, metadata = doc_loader.load_from_bytes(file_bytes, uploaded_file.name)
+        # getvalue() hands back the upload buffer without copying it
+        file_bytes = uploaded_file.getvalue()
+        analysis = _analyze(file_bytes, uploaded_file.name, settings['detect_hindi'])
         
-        if not text or len(text.strip()) < 100:
+        text = analysis.pop('source_text')
+        metadata = analysis['metadata']
+        
+        if 'risk_report' not in analysis:
             st.error("Could not extract sufficient text from the document. Please try a different file.")
             return None
         
@@ -236,76 +490,45 @@ def process_document(uploaded_file, settings):
         # Log upload
         st.session_state.audit_logger.log_document_upload(
             uploaded_file.name, 
-            len(file_bytes),
-            metadata.get('language', 'en')
+            uploaded_file.size,
+            content_hash=hashlib.sha256(file_bytes).hexdigest(),
+            metadata={'language': metadata.get('language', 'en')}
         )
         
-        # Step 2: Language detection and processing
-        status_text.text("🌐 Detecting language...")
-        progress_bar.progress(20)
-        
-        if settings['detect_hindi'] and hindi_processor.is_hindi(text):
-            status_text.text("🔄 Processing Hindi content...")
-            text = hindi_processor.prepare_for_nlp(text)
-            metadata['original_language'] = 'hindi'
+        text = analysis['text']
+        classification = analysis['classification']
+        risk_report = analysis['risk_report']
         
-        # Step 3: Classify contract type
-        status_text.text("📋 Classifying contract type...")
-        progress_bar.progress(30)
-        
-        classification = classifier.classify(text)
         st.session_state.contract_type = classification
+        st.session_state.clauses = analysis['clauses']
+        st.session_state.risk_report = risk_report
         
-        # Step 4: Extract clauses
-        status_text.text("📝 Extracting clauses...")
-        progress_bar.progress(45)
-        
-        clauses = clause_extractor.extract_clauses(text)
-        data_dimensions = clause_extractor.extract_data_dimensions(text)
-        st.session_state.clauses = clauses
-        
-        # Step 5: NLP Processing
-        status_text.text("🧠 Performing NLP analysis...")
-        progress_bar.progress(60)
-        
-        nlp_results = nlp_pipeline.process(text)
-        
-        # Step 6: Risk Assessment
-        status_text.text("⚠️ Assessing risks...")
-        progress_bar.progress(75)
+        _tick(75)
         
-        clause_dicts = [
+        # Log risk findings (one write for the batch)
+        st.session_state.audit_logger.log_many([
             {
-                "clause_id": c.clause_id,
-                "title": c.title,
-                "content": c.content,
-                "category": c.category,
-                "risk_indicators": c.risk_indicators
+                "event_type": "risk_finding",
+                "data": {
+                    "document_id": uploaded_file.name,
+                    "risk_type": finding.risk_type,
+                    "risk_level": finding.risk_level.value if hasattr(finding.risk_level, 'value') else str(finding.risk_level),
+                    "clause_id": None
+                }
             }
-            for c in clauses
-        ]
-        
-        risk_report = risk_assessor.assess_contract(text, clause_dicts)
-        st.session_state.risk_report = risk_report
-        
-        # Log risk findings
-        for finding in risk_report.findings[:5]:
-            st.session_state.audit_logger.log_risk_finding(
-                uploaded_file.name,
-                finding.risk_type,
-                finding.risk_level.value if hasattr(finding.risk_level, 'value') else str(finding.risk_level)
-            )
+            for finding in risk_report.findings[:5]
+        ])
         
-        # Step 7: LLM Analysis (if enabled)
+        # Step 2: LLM Analysis (if enabled)
         llm_analysis = None
         if settings['enable_llm'] and settings.get('api_key'):
-            status_text.text("🤖 Generating AI analysis...")
-            progress_bar.progress(85)
+            _tick(85, "🤖 Generating AI analysis...")
             
+            LegalAnalyzer = _get_legal_analyzer()
             analyzer = LegalAnalyzer(api_key=settings['api_key'])
             
             if analyzer.is_available():
-                result = analyzer.summarize_contract(text[:10000])
+                result = analyzer.summarize_contract_chunked(text)
                 if result.success:
                     llm_analysis = result.content
                     st.session_state.llm_analysis = llm_analysis
@@ -316,27 +539,15 @@ def process_document(uploaded_file, settings):
                         True
                     )
         
-        # Step 8: Compile results
-        status_text.text("✅ Compiling results...")
-        progress_bar.progress(95)
-        
-        results = {
-            'text': text,
-            'metadata': metadata,
-            'classification': classification,
-            'clauses': clauses,
-            'clause_dicts': clause_dicts,
-            'data_dimensions': data_dimensions,
-            'nlp_results': nlp_results,
-            'risk_report': risk_report,
-            'llm_analysis': llm_analysis
-        }
+        # Step 3: Compile results
+        _tick(95, "✅ Compiling results...")
+        
+        results = analysis
+        results['llm_analysis'] = llm_analysis
         
         st.session_state.analysis_results = results
         
-        progress_bar.progress(100)
-        status_text.text("✅ Analysis complete!")
-        time.sleep(0.5)
+        _tick(100, "✅ Analysis complete!")
         progress_bar.empty()
         status_text.empty()
         
@@ -434,6 +645,7 @@ def render_summary_tab(results):
                 st.markdown(f"- {condition[:150]}...")
 
 
+@_fragment
 def render_risk_tab(results):
     """Render the risk assessment tab"""
     st.header("⚠️ Risk Assessment")
@@ -510,6 +722,7 @@ def render_risk_tab(results):
                     st.caption(f"📚 **Indian Law Reference:** {indian_law}")
 
 
+@_fragment
 def render_clauses_tab(results, show_all=False):
     """Render the clause analysis tab"""
     st.header("📝 Clause Analysis")
@@ -522,15 +735,15 @@ def render_clauses_tab(results, show_all=False):
     
     st.write(f"**Total clauses extracted:** {len(clauses)}")
     
-    # Category summary
-    categories = {}
-    for clause in clauses:
-        cat = clause.category
-        categories[cat] = categories.get(cat, 0) + 1
+    # Lower-cased text and category index are built once per analysis
+    clause_index = results['clause_index']
+    by_category = clause_index['by_category']
+    search_index = clause_index['search']
     
+    # Category summary
     with st.expander("📊 Clause Categories"):
-        for cat, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
-            st.markdown(f"- **{cat.replace('_', ' ').title()}:** {count} clause(s)")
+        for cat, indices in sorted(by_category.items(), key=lambda x: len(x[1]), reverse=True):
+            st.markdown(f"- **{cat.replace('_', ' ').title()}:** {len(indices)} clause(s)")
     
     st.markdown("---")
     
@@ -543,25 +756,32 @@ def render_clauses_tab(results, show_all=False):
     with col2:
         filter_category = st.selectbox(
             "Filter by category",
-            ["All"] + list(set(c.category for c in clauses))
+            ["All"] + list(by_category)
         )
     
     # Display clauses
     displayed = 0
     max_display = 20 if show_all else 10
     
-    for clause in clauses:
-        # Apply filters
-        if filter_category != "All" and clause.category != filter_category:
-            continue
-        
-        if search and search.lower() not in clause.content.lower() and search.lower() not in clause.title.lower():
-            continue
+    # Apply filters
+    if filter_category == "All":
+        candidates = range(len(clauses))
+    else:
+        candidates = by_category.get(filter_category, [])
+    
+    needle = search.lower()
+    
+    for i in candidates:
+        if needle:
+            title_lower, content_lower = search_index[i]
+            if needle not in content_lower and needle not in title_lower:
+                continue
         
         if displayed >= max_display:
             break
         
         displayed += 1
+        clause = clauses[i]
         
         # Determine styling based on risk
         has_risk = bool(clause.risk_indicators)
@@ -600,6 +820,7 @@ def render_clauses_tab(results, show_all=False):
         st.info(f"Showing {displayed} of {len(clauses)} clauses. Enable 'Show All Clauses' in settings to see more.")
 
 
+@_fragment
 def render_ai_analysis_tab(results, settings):
     """Render the AI analysis tab"""
     st.header("🤖 AI-Powered Analysis")
@@ -634,23 +855,31 @@ def render_ai_analysis_tab(results, settings):
     with col1:
         if st.button("📝 Generate Detailed Summary", use_container_width=True):
             with st.spinner("Generating summary..."):
+                LegalAnalyzer = _get_legal_analyzer()
                 analyzer = LegalAnalyzer(api_key=settings['api_key'])
                 if analyzer.is_available() and st.session_state.contract_text:
-                    result = analyzer.summarize_contract(st.session_state.contract_text[:10000])
+                    output = st.empty()
+                    result = analyzer.summarize_contract(
+                        st.session_state.contract_text, on_delta=_stream_markdown(output)
+                    )
                     if result.success:
-                        st.markdown(result.content)
+                        output.markdown(result.content)
                     else:
                         st.error(f"Error: {result.error}")
     
     with col2:
         if st.button("⚖️ Check Indian Law Compliance", use_container_width=True):
             with st.spinner("Checking compliance..."):
+                LegalAnalyzer = _get_legal_analyzer()
                 analyzer = LegalAnalyzer(api_key=settings['api_key'])
                 if analyzer.is_available() and st.session_state.contract_text:
                     contract_type = st.session_state.contract_type.contract_type if st.session_state.contract_type else "General"
-                    result = analyzer.check_compliance(st.session_state.contract_text[:10000], contract_type)
+                    output = st.empty()
+                    result = analyzer.check_compliance(
+                        st.session_state.contract_text, contract_type, on_delta=_stream_markdown(output)
+                    )
                     if result.success:
-                        st.markdown(result.content)
+                        output.markdown(result.content)
                     else:
                         st.error(f"Error: {result.error}")
     
@@ -666,15 +895,50 @@ def render_ai_analysis_tab(results, settings):
     
     if st.button("Explain Clause") and clause_text:
         with st.spinner("Generating explanation..."):
+            LegalAnalyzer = _get_legal_analyzer()
             analyzer = LegalAnalyzer(api_key=settings['api_key'])
             if analyzer.is_available():
-                result = analyzer.explain_clause(clause_text)
+                output = st.empty()
+                result = analyzer.explain_clause(clause_text, on_delta=_stream_markdown(output))
                 if result.success:
-                    st.markdown(result.content)
+                    output.markdown(result.content)
                 else:
                     st.error(f"Error: {result.error}")
 
 
+def _build_summary_text(results) -> str:
+    """Build the plain-text export summary (the generation date is appended by the caller)"""
+    classification = results['classification']
+    risk_report = results['risk_report']
+    parties = results['data_dimensions'].get('parties', [])[:5]
+    parties_text = "\n".join("- " + p for p in parties) or 'None identified'
+    
+    return f"""
+CONTRACT ANALYSIS SUMMARY
+========================
+
+Contract Type: {classification.contract_type}
+Confidence: {classification.confidence:.0%}
+Word Count: {results['metadata'].get('word_count', 0)}
+
+RISK ASSESSMENT
+---------------
+Overall Score: {risk_report.overall_score}/10
+Risk Level: {risk_report.overall_level.value}
+High Risk Clauses: {risk_report.high_risk_count}
+Medium Risk Clauses: {risk_report.medium_risk_count}
+
+Summary: {risk_report.summary}
+
+PARTIES IDENTIFIED
+------------------
+{parties_text}
+
+Generated by Contract Analysis Bot
+"""
+
+
+@_fragment
 def render_export_tab(results, settings):
     """Render the export tab"""
     st.header("📥 Export Report")
@@ -687,6 +951,7 @@ def render_export_tab(results, settings):
         
         if st.button("Generate PDF Report", type="primary", use_container_width=True):
             with st.spinner("Generating PDF..."):
+                PDFExporter = _get_pdf_exporter()
                 exporter = PDFExporter()
                 
                 if exporter.is_available():
@@ -718,35 +983,29 @@ def render_export_tab(results, settings):
                     }
                     
                     clauses = [
-                        {
-                            'clause_id': c.clause_id,
-                            'title': c.title,
-                            'category': c.category,
-                            'content': c.content
-                        }
+                        dict(zip(_EXPORT_CLAUSE_FIELDS, _get_export_clause_fields(c)))
                         for c in results['clauses'][:15]
                     ]
                     
-                    pdf_path = exporter.generate_report(
+                    pdf_bytes = exporter.generate_report_bytes(
                         summary,
                         risk_report,
                         clauses,
                         results.get('llm_analysis', '')
                     )
                     
-                    if pdf_path:
-                        with open(pdf_path, 'rb') as f:
-                            st.download_button(
-                                label="⬇️ Download PDF",
-                                data=f.read(),
-                                file_name=f"contract_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
-                                mime="application/pdf",
-                                use_container_width=True
-                            )
+                    if pdf_bytes:
+                        st.download_button(
+                            label="⬇️ Download PDF",
+                            data=pdf_bytes,
+                            file_name=f"contract_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.pdf",
+                            mime="application/pdf",
+                            use_container_width=True
+                        )
                         st.success(f"PDF generated successfully!")
                         
                         # Log export
-                        st.session_state.audit_logger.log_export("document", "PDF", pdf_path)
+                        st.session_state.audit_logger.log_export("document", "PDF", "download")
                     else:
                         st.error("Failed to generate PDF.")
                 else:
@@ -756,31 +1015,10 @@ def render_export_tab(results, settings):
         st.subheader("📋 Copy Summary")
         st.markdown("Copy a text summary to clipboard.")
         
-        # Generate text summary
-        summary_text = f"""
-CONTRACT ANALYSIS SUMMARY
-========================
-
-Contract Type: {results['classification'].contract_type}
-Confidence: {results['classification'].confidence:.0%}
-Word Count: {results['metadata'].get('word_count', 0)}
-
-RISK ASSESSMENT
----------------
-Overall Score: {results['risk_report'].overall_score}/10
-Risk Level: {results['risk_report'].overall_level.value}
-High Risk Clauses: {results['risk_report'].high_risk_count}
-Medium Risk Clauses: {results['risk_report'].medium_risk_count}
-
-Summary: {results['risk_report'].summary}
-
-PARTIES IDENTIFIED
-------------------
-{chr(10).join('- ' + p for p in results['data_dimensions'].get('parties', [])[:5]) or 'None identified'}
-
-Generated by Contract Analysis Bot
-Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}
-"""
+        # Text summary is built once per analysis; only the date changes
+        if 'summary_text' not in results:
+            results['summary_text'] = _build_summary_text(results)
+        summary_text = results['summary_text'] + f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
         
         st.text_area("Summary Text", summary_text, height=300)
         st.info("Select all text above and copy (Ctrl+C)")
@@ -802,6 +1040,9 @@ Date: {datetime.now().strftime('%Y-%m-%d %H:%M')}
 def main():
     """Main application entry point"""
     
+    # Start loading the NLP pipeline while the page renders
+    _start_warmup()
+    
     # Initialize session state
     initialize_session_state()
     
@@ -870,47 +1111,11 @@ def main():
     
     else:
         # Welcome message when no file uploaded
-        st.markdown("""
-        <div style="
-            background: #f8f9fa;
-            border-radius: 10px;
-            padding: 2rem;
-            text-align: center;
-            margin: 2rem 0;
-        ">
-            <h2>👋 Welcome to Contract Analysis Bot</h2>
-            <p>Upload a contract document to get started with AI-powered analysis.</p>
-            <br>
-            <h4>What this tool does:</h4>
-            <div style="display: flex; justify-content: space-around; flex-wrap: wrap; gap: 1rem; margin-top: 1rem;">
-                <div style="flex: 1; min-width: 200px;">
-                    <h3>📋</h3>
-                    <p><strong>Classify</strong><br>Identify contract type</p>
-                </div>
-                <div style="flex: 1; min-width: 200px;">
-                    <h3>⚠️</h3>
-                    <p><strong>Assess Risk</strong><br>Find risky clauses</p>
-                </div>
-                <div style="flex: 1; min-width: 200px;">
-                    <h3>🧠</h3>
-                    <p><strong>Explain</strong><br>Plain language summaries</p>
-                </div>
-                <div style="flex: 1; min-width: 200px;">
-                    <h3>💡</h3>
-                    <p><strong>Suggest</strong><br>Negotiation alternatives</p>
-                </div>
-            </div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(_WELCOME_HTML, unsafe_allow_html=True)
     
     # Footer
     st.markdown("---")
-    st.markdown("""
-    <div style="text-align: center; color: #888; font-size: 0.8rem;">
-        <p>Contract Analysis & Risk Assessment Bot | GUVI HCL Hackathon 2026</p>
-        <p>⚠️ This tool provides AI-powered analysis and does not constitute legal advice.</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(_FOOTER_HTML, unsafe_allow_html=True)
 
 
 if __name__ == "__main__":
@@ -3,15 +3,24 @@ Core module for Contract Analysis & Risk Assessment Bot
 """
 
 from .document_loader import DocumentLoader
-from .nlp_pipeline import NLPPipeline
 from .clause_extractor import ClauseExtractor
 from .risk_assessor import RiskAssessor
 from .contract_classifier import ContractClassifier
+from .keyword_matcher import KeywordMatcher
 
 __all__ = [
     "DocumentLoader",
     "NLPPipeline", 
     "ClauseExtractor",
     "RiskAssessor",
-    "ContractClassifier"
+    "ContractClassifier",
+    "KeywordMatcher"
 ]
+
+
+def __getattr__(name):
+    """Import the spaCy-backed NLPPipeline only when it is first requested"""
+    if name == "NLPPipeline":
+        from .nlp_pipeline import NLPPipeline
+        return NLPPipeline
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -4,11 +4,109 @@ Extracts and categorizes contract clauses with detailed analysis
 """
 
 import re
+import sys
+from bisect import bisect_left
+from functools import lru_cache
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, field
 
+from .keyword_matcher import KeywordMatcher
+from .regex_engine import compile_pattern
 
-@dataclass
+# __slots__ keeps per-clause memory down; dataclass(slots=...) needs Python 3.10+
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Clause headings, as one alternation so the text is scanned once and matches
+# arrive in document order. Each style has an id group and a <name>_title group.
+_CLAUSE_HEADING_RE = compile_pattern(
+    r'(?:^|\n)\s*(?:'
+    # Numbered clauses: 1., 1.1, 1.1.1, etc.
+    r'(?P<num>\d+(?:\.\d+)*)\s*[\.:\)]\s*(?P<num_title>[A-Z][^\n]{0,100})'
+    # Article/Section/Clause headers
+    r'|(?:ARTICLE|Article|SECTION|Section|CLAUSE|Clause)\s*(?P<art>\d+(?:\.\d+)?)[\.:\s]+(?P<art_title>[^\n]+)'
+    # Roman numeral sections
+    r'|(?P<rom>[IVXLC]+)\s*[\.:\)]\s*(?P<rom_title>[^\n]+)'
+    # Lettered subsections: (a), (b), etc.
+    r'|\((?P<let>[a-z])\)\s*(?P<let_title>[^\n]+)'
+    r')',
+    re.MULTILINE | re.IGNORECASE
+)
+
+
+def _iter_clause_heads(text: str):
+    """
+    Yield (clause_id, title, heading_start, heading_end) for each clause heading,
+    in document order, from a single scan of the text
+    """
+    for match in _CLAUSE_HEADING_RE.finditer(text):
+        # lastgroup is the "<style>_title" group of whichever heading style matched
+        title_group = match.lastgroup
+        yield (
+            match.group(title_group[:-len("_title")]),
+            match.group(title_group).strip(),
+            match.start(),
+            match.end()
+        )
+
+
+# Data dimension patterns
+_PARTY_PATTERNS = [
+    compile_pattern(pattern, re.IGNORECASE | re.DOTALL)
+    for pattern in (
+        r'(?:between|BETWEEN)\s+(.+?)\s+(?:and|AND)\s+(.+?)(?:\.|,|\n)',
+        r'(?:Party\s*[AB12])[:\s]+(.+?)(?:\n|,|\.)',
+        r'(?:hereinafter.*(?:called|referred).*["\'](.+?)["\'])',
+    )
+]
+_AMOUNT_VALUE_RE = compile_pattern(r'(?:Rs\.?|INR|₹|\$)\s*([\d,]+(?:\.\d{2})?)')
+_DURATION_RE = compile_pattern(
+    r'(?:term|period|duration)\s+(?:of\s+)?(\d+)\s+(years?|months?|days?)', re.IGNORECASE
+)
+_JURISDICTION_RE = compile_pattern(
+    r'(?:governed by|subject to|jurisdiction of)\s+(?:the\s+)?(?:laws?\s+of\s+)?([A-Za-z\s,]+)(?:\.|\n|$)',
+    re.IGNORECASE
+)
+_TERMINATION_CONDITION_RE = compile_pattern(
+    r'(?:may\s+terminate|terminate.*(?:if|upon|when))(.+?)(?:\.|;|$)', re.IGNORECASE
+)
+_IP_RE = compile_pattern(
+    r'(?:intellectual\s+property|patent|copyright|trademark|invention)(.{0,200})', re.IGNORECASE
+)
+
+# Per-clause amounts and dates, as one alternation scanned once over the whole text.
+# Groups named amount_* / date_* tell the caller which list a match belongs to.
+# Amounts written with a unit ('5 lakhs') overlap currency amounts ('Rs. 5 lakhs'),
+# so they are scanned separately below rather than as another alternative.
+_AMOUNT_DATE_RE = compile_pattern(
+    r'(?P<amount_inr>(?:Rs\.?|INR|₹)\s*[\d,]+(?:\.\d{2})?)'
+    r'|(?P<amount_usd>\$\s*[\d,]+(?:\.\d{2})?)'
+    r'|(?P<date_numeric>\b\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}\b)'
+    r'|(?P<date_day_month>\b\d{1,2}(?:st|nd|rd|th)?\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*,?\s*\d{4}\b)'
+    r'|(?P<date_month_day>\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b)',
+    re.IGNORECASE
+)
+_AMOUNT_UNIT_RE = compile_pattern(r'[\d,]+\s*(?:rupees|dollars|lakhs?|crores?)', re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def _section_pattern(keyword: str):
+    """Compiled section-lookup pattern for a keyword (built once per keyword)"""
+    return compile_pattern(
+        rf'(?:^|\n)\s*(?:\d+(?:\.\d+)*\.?\s*)?[^\n]*{keyword}[^\n]*\n.+?(?=(?:^|\n)\s*\d+(?:\.\d+)*\.\s*[A-Z]|\Z)',
+        re.IGNORECASE | re.MULTILINE | re.DOTALL
+    )
+
+
+def _invert_keyword_index(categories: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Map each keyword to the categories whose keyword list contains it"""
+    index: Dict[str, List[str]] = {}
+    for category, keywords in categories.items():
+        for keyword in keywords:
+            index.setdefault(keyword, []).append(category)
+    return index
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ExtractedClause:
     """Represents an extracted contract clause with analysis"""
     clause_id: str
@@ -122,6 +220,33 @@ class ClauseExtractor:
         ]
     }
     
+    # Important legal terms reported per clause, in reporting order
+    LEGAL_TERMS = [
+        "shall", "must", "may", "will", "agrees", "warrants", "represents",
+        "indemnify", "terminate", "liable", "confidential", "proprietary",
+        "exclusive", "non-exclusive", "irrevocable", "perpetual"
+    ]
+    
+    _LEGAL_TERMS_MATCHER = KeywordMatcher(LEGAL_TERMS)
+    
+    # All CLAUSE_CATEGORIES keywords, looked up in one pass per clause
+    _CATEGORY_MATCHER = KeywordMatcher(
+        keyword for keywords in CLAUSE_CATEGORIES.values() for keyword in keywords
+    )
+    
+    # Inverted index keyword -> categories it scores for, and each category's
+    # position in CLAUSE_CATEGORIES (earlier categories win ties)
+    _CATEGORY_INDEX = _invert_keyword_index(CLAUSE_CATEGORIES)
+    _CATEGORY_ORDER = {category: position for position, category in enumerate(CLAUSE_CATEGORIES)}
+    
+    # One alternation per risk type (same keys as HIGH_RISK_PATTERNS), compiled once;
+    # a single search answers "did any of this type's patterns fire". The patterns
+    # are all lower-case and only ever run on lower-cased text, so no IGNORECASE.
+    _HIGH_RISK_REGEXES = {
+        risk_type: compile_pattern("|".join(f"(?:{pattern})" for pattern in patterns))
+        for risk_type, patterns in HIGH_RISK_PATTERNS.items()
+    }
+    
     def __init__(self):
         self.clauses: List[ExtractedClause] = []
     
@@ -135,158 +260,172 @@ class ClauseExtractor:
         Returns:
             List of ExtractedClause objects
         """
-        self.clauses = []
-        
-        # Multiple patterns for clause detection
-        clause_patterns = [
-            # Numbered clauses: 1., 1.1, 1.1.1, etc.
-            r'(?:^|\n)\s*(\d+(?:\.\d+)*)\s*[\.:\)]\s*([A-Z][^\n]{0,100})',
-            # Article/Section/Clause headers
-            r'(?:^|\n)\s*(?:ARTICLE|Article|SECTION|Section|CLAUSE|Clause)\s*(\d+(?:\.\d+)?)[\.:\s]+([^\n]+)',
-            # Roman numeral sections
-            r'(?:^|\n)\s*([IVXLC]+)\s*[\.:\)]\s*([^\n]+)',
-            # Lettered subsections: (a), (b), etc.
-            r'(?:^|\n)\s*\(([a-z])\)\s*([^\n]+)',
-        ]
+        # Built locally and published at the end, so a shared (cached)
+        # extractor never hands out a list another call is still filling
+        clauses: List[ExtractedClause] = []
         
-        all_matches = []
+        # Amounts and dates for every clause come from two scans of the text,
+        # merged into document order
+        value_matches = [
+            (m.start(), m.end(), m.lastgroup, m.group())
+            for m in _AMOUNT_DATE_RE.finditer(text)
+        ]
+        value_matches.extend(
+            (m.start(), m.end(), "amount_unit", m.group())
+            for m in _AMOUNT_UNIT_RE.finditer(text)
+        )
+        value_matches.sort()
+        value_starts = [m[0] for m in value_matches]
         
-        for pattern in clause_patterns:
-            matches = list(re.finditer(pattern, text, re.MULTILINE | re.IGNORECASE))
-            for match in matches:
-                all_matches.append({
-                    "id": match.group(1),
-                    "title": match.group(2).strip() if len(match.groups()) > 1 else "",
-                    "start": match.start(),
-                    "end": match.end()
-                })
-        
-        # Sort by position
-        all_matches.sort(key=lambda x: x["start"])
-        
-        # Extract content for each clause
-        for i, match in enumerate(all_matches):
-            start = match["end"]
-            end = all_matches[i + 1]["start"] if i + 1 < len(all_matches) else len(text)
-            content = text[start:end].strip()
-            
-            # Skip if content is too short
-            if len(content) < 20:
-                continue
-            
-            # Categorize the clause
-            category = self._categorize_clause(match["title"], content)
+        # Each clause runs from the end of its heading to the start of the next;
+        # headings are consumed lazily, holding only the current and next one
+        heads = _iter_clause_heads(text)
+        head = next(heads, None)
+        while head is not None:
+            next_head = next(heads, None)
+            end = next_head[2] if next_head is not None else len(text)
             
-            # Extract risk indicators
-            risk_indicators = self._find_risk_indicators(content)
+            clause = self._build_clause(text, head, end, value_matches, value_starts)
+            if clause is not None:
+                clauses.append(clause)
             
-            # Extract key terms
-            key_terms = self._extract_key_terms(content)
-            
-            # Extract amounts
-            amounts = self._extract_amounts(content)
-            
-            # Extract dates
-            dates = self._extract_dates(content)
-            
-            clause = ExtractedClause(
-                clause_id=str(match["id"]),
-                title=match["title"][:200],
-                content=content[:2000],  # Limit content size
-                category=category,
-                risk_indicators=risk_indicators,
-                key_terms=key_terms,
-                amounts=amounts,
-                dates=dates
-            )
-            
-            self.clauses.append(clause)
+            head = next_head
+        
+        self.clauses = clauses
+        return clauses
+    
+    def _build_clause(self, text: str, head: tuple, end: int,
+                      value_matches: List[tuple], value_starts: List[int]) -> Optional[ExtractedClause]:
+        """
+        Build the clause whose heading is `head` and whose body ends at `end`
+        
+        Returns:
+            ExtractedClause, or None if the body is too short to be a clause
+        """
+        clause_id, title, _, start = head
+        raw_content = text[start:end]
+        content = raw_content.strip()
+        
+        # Skip if content is too short
+        if len(content) < 20:
+            return None
+        
+        # Lower-case once for all the case-insensitive lookups below
+        content_lower = content.lower()
+        
+        # Categorize the clause
+        category = self._categorize_clause(title.lower(), content_lower)
+        
+        # Extract risk indicators
+        risk_indicators = self._find_risk_indicators(content_lower)
+        
+        # Extract key terms
+        key_terms = self._extract_key_terms(content_lower)
+        
+        # Extract amounts and dates falling inside this clause
+        content_start = start + len(raw_content) - len(raw_content.lstrip())
+        amounts, dates = self._values_in_range(
+            value_matches, value_starts, content_start, content_start + len(content)
+        )
         
-        return self.clauses
+        return ExtractedClause(
+            clause_id=str(clause_id),
+            title=title[:200],
+            content=content[:2000],  # Limit content size
+            category=category,
+            risk_indicators=risk_indicators,
+            key_terms=key_terms,
+            amounts=amounts,
+            dates=dates
+        )
     
-    def _categorize_clause(self, title: str, content: str) -> str:
-        """Determine the category of a clause based on title and content"""
-        combined_text = (title + " " + content).lower()
+    def _categorize_clause(self, title_lower: str, content_lower: str) -> str:
+        """Determine the category of a clause based on lower-cased title and content"""
+        combined_text = title_lower + " " + content_lower
         
-        category_scores = {}
+        category_scores: Dict[str, int] = {}
         
-        for category, keywords in self.CLAUSE_CATEGORIES.items():
-            score = sum(1 for keyword in keywords if keyword in combined_text)
-            if score > 0:
-                category_scores[category] = score
+        # Only keywords actually present contribute, so work is O(hits)
+        for keyword in self._CATEGORY_MATCHER.find(combined_text):
+            for category in self._CATEGORY_INDEX[keyword]:
+                category_scores[category] = category_scores.get(category, 0) + 1
         
         if category_scores:
-            return max(category_scores, key=category_scores.get)
+            return min(
+                category_scores,
+                key=lambda category: (-category_scores[category], self._CATEGORY_ORDER[category])
+            )
         
         return "general"
     
-    def _find_risk_indicators(self, content: str) -> List[str]:
-        """Find high-risk patterns in clause content"""
+    def _find_risk_indicators(self, content_lower: str) -> List[str]:
+        """Find high-risk patterns in lower-cased clause content"""
         risk_indicators = []
-        content_lower = content.lower()
         
-        for risk_type, patterns in self.HIGH_RISK_PATTERNS.items():
-            for pattern in patterns:
-                if re.search(pattern, content_lower, re.IGNORECASE):
-                    risk_indicators.append(risk_type)
-                    break
+        for risk_type, pattern in self._HIGH_RISK_REGEXES.items():
+            if pattern.search(content_lower):
+                risk_indicators.append(risk_type)
         
-        return list(set(risk_indicators))
+        # At most one entry per risk type already, in HIGH_RISK_PATTERNS order
+        return risk_indicators
     
-    def _extract_key_terms(self, content: str) -> List[str]:
-        """Extract important legal terms from clause"""
-        legal_terms = [
-            "shall", "must", "may", "will", "agrees", "warrants", "represents",
-            "indemnify", "terminate", "liable", "confidential", "proprietary",
-            "exclusive", "non-exclusive", "irrevocable", "perpetual"
-        ]
-        
-        found_terms = []
-        content_lower = content.lower()
+    def _extract_key_terms(self, content_lower: str) -> List[str]:
+        """Extract important legal terms from lower-cased clause content"""
+        present = self._LEGAL_TERMS_MATCHER.find(content_lower)
         
-        for term in legal_terms:
-            if term in content_lower:
-                found_terms.append(term)
+        # Keep LEGAL_TERMS order for the reported terms
+        found_terms = [term for term in self.LEGAL_TERMS if term in present]
         
         return found_terms[:10]
     
-    def _extract_amounts(self, content: str) -> List[str]:
-        """Extract monetary amounts from clause"""
-        patterns = [
-            r'(?:Rs\.?|INR|₹)\s*[\d,]+(?:\.\d{2})?',
-            r'\$\s*[\d,]+(?:\.\d{2})?',
-            r'[\d,]+\s*(?:rupees|dollars|lakhs?|crores?)'
-        ]
+    def _values_in_range(self, value_matches: List[tuple], value_starts: List[int],
+                         start: int, end: int) -> tuple:
+        """
+        Split the pre-scanned amount/date matches lying within [start, end)
         
+        Returns:
+            Tuple of (amounts, dates), each capped at 5 entries; currency
+            amounts come before amounts written with a unit
+        """
         amounts = []
-        for pattern in patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            amounts.extend(matches)
-        
-        return amounts[:5]
-    
-    def _extract_dates(self, content: str) -> List[str]:
-        """Extract dates from clause"""
-        patterns = [
-            r'\b\d{1,2}[\/\-]\d{1,2}[\/\-]\d{2,4}\b',
-            r'\b\d{1,2}(?:st|nd|rd|th)?\s+(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]*\s*,?\s*\d{4}\b',
-            r'\b(?:January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}\b'
-        ]
-        
+        unit_amounts = []
         dates = []
-        for pattern in patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            dates.extend(matches)
         
-        return dates[:5]
+        for i in range(bisect_left(value_starts, start), len(value_matches)):
+            match_start, match_end, kind, value = value_matches[i]
+            if match_start >= end:
+                break
+            if match_end > end:
+                continue
+            if kind.startswith("date"):
+                dates.append(value)
+            elif kind == "amount_unit":
+                unit_amounts.append(value)
+            else:
+                amounts.append(value)
+        
+        return (amounts + unit_amounts)[:5], dates[:5]
     
     def extract_data_dimensions(self, text: str) -> Dict[str, Any]:
         """
         Extract all required data dimensions from the contract
         
+        Results are memoised per text (LRU, 32 documents); each call gets
+        its own copy, so callers may modify it freely.
+        
         Returns:
             Dictionary with all extracted dimensions
         """
+        dimensions = self._data_dimensions_cached(text)
+        return {
+            key: list(value) if isinstance(value, list) else value
+            for key, value in dimensions.items()
+        }
+    
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _data_dimensions_cached(text: str) -> Dict[str, Any]:
+        """Compute the data dimensions for a text (shared cached result, do not modify)"""
         dimensions = {
             "parties": [],
             "financial_amounts": [],
@@ -302,65 +441,71 @@ class ClauseExtractor:
             "confidentiality_terms": [],
             "nda_terms": []
         }
+        text_lower = text.lower()
         
         # Extract parties
-        party_patterns = [
-            r'(?:between|BETWEEN)\s+(.+?)\s+(?:and|AND)\s+(.+?)(?:\.|,|\n)',
-            r'(?:Party\s*[AB12])[:\s]+(.+?)(?:\n|,|\.)',
-            r'(?:hereinafter.*(?:called|referred).*["\'](.+?)["\'])'
-        ]
-        
-        for pattern in party_patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE | re.DOTALL)
+        for pattern in _PARTY_PATTERNS:
+            matches = pattern.findall(text)
             for match in matches:
                 if isinstance(match, tuple):
                     dimensions["parties"].extend([m.strip() for m in match if m.strip()])
                 else:
                     dimensions["parties"].append(match.strip())
         
-        dimensions["parties"] = list(set(dimensions["parties"]))[:10]
+        # Dedupe keeping first-seen order
+        dimensions["parties"] = list(dict.fromkeys(dimensions["parties"]))[:10]
         
         # Extract financial amounts
-        amount_pattern = r'(?:Rs\.?|INR|₹|\$)\s*([\d,]+(?:\.\d{2})?)'
-        dimensions["financial_amounts"] = re.findall(amount_pattern, text)[:20]
+        dimensions["financial_amounts"] = _AMOUNT_VALUE_RE.findall(text)[:20]
         
         # Extract duration
-        duration_pattern = r'(?:term|period|duration)\s+(?:of\s+)?(\d+)\s+(years?|months?|days?)'
-        duration_match = re.search(duration_pattern, text, re.IGNORECASE)
+        duration_match = _DURATION_RE.search(text)
         if duration_match:
             dimensions["duration"] = f"{duration_match.group(1)} {duration_match.group(2)}"
         
         # Extract jurisdiction/governing law
-        jurisdiction_pattern = r'(?:governed by|subject to|jurisdiction of)\s+(?:the\s+)?(?:laws?\s+of\s+)?([A-Za-z\s,]+)(?:\.|\n|$)'
-        jurisdiction_match = re.search(jurisdiction_pattern, text, re.IGNORECASE)
+        jurisdiction_match = _JURISDICTION_RE.search(text)
         if jurisdiction_match:
             dimensions["jurisdiction"] = jurisdiction_match.group(1).strip()
             dimensions["governing_law"] = jurisdiction_match.group(1).strip()
         
         # Extract termination conditions
-        termination_section = self._extract_section(text, ["termination", "terminate"])
+        termination_section = ClauseExtractor._extract_section(
+            text, ["termination", "terminate"], text_lower
+        )
         if termination_section:
-            conditions = re.findall(r'(?:may\s+terminate|terminate.*(?:if|upon|when))(.+?)(?:\.|;|$)', 
-                                    termination_section, re.IGNORECASE)
+            conditions = _TERMINATION_CONDITION_RE.findall(termination_section)
             dimensions["termination_conditions"] = [c.strip()[:200] for c in conditions[:5]]
         
         # Extract IP rights mentions
-        ip_pattern = r'(?:intellectual\s+property|patent|copyright|trademark|invention)(.{0,200})'
-        ip_matches = re.findall(ip_pattern, text, re.IGNORECASE)
+        ip_matches = _IP_RE.findall(text)
         dimensions["ip_rights"] = [match.strip()[:200] for match in ip_matches[:5]]
         
         # Extract confidentiality terms
-        conf_section = self._extract_section(text, ["confidential", "non-disclosure", "nda"])
+        conf_section = ClauseExtractor._extract_section(
+            text, ["confidential", "non-disclosure", "nda"], text_lower
+        )
         if conf_section:
             dimensions["confidentiality_terms"] = [conf_section[:500]]
         
         return dimensions
     
-    def _extract_section(self, text: str, keywords: List[str]) -> Optional[str]:
-        """Extract a section of text containing specific keywords"""
+    @staticmethod
+    def _extract_section(text: str, keywords: List[str],
+                         text_lower: Optional[str] = None) -> Optional[str]:
+        """
+        Extract a section of text containing specific keywords
+        
+        Args:
+            text: Full contract text
+            keywords: Keywords to try, in priority order
+            text_lower: Pre-computed text.lower(); keywords that do not occur
+                        in it are skipped without running the section regex
+        """
         for keyword in keywords:
-            pattern = rf'(?:^|\n)\s*(?:\d+(?:\.\d+)*\.?\s*)?[^\n]*{keyword}[^\n]*\n(.+?)(?=(?:^|\n)\s*\d+(?:\.\d+)*\.\s*[A-Z]|\Z)'
-            match = re.search(pattern, text, re.IGNORECASE | re.MULTILINE | re.DOTALL)
+            if text_lower is not None and keyword not in text_lower:
+                continue
+            match = _section_pattern(keyword).search(text)
             if match:
                 return match.group(0)[:1000]
         return None
@@ -388,6 +533,7 @@ if __name__ == "__main__":
     3. PAYMENT TERMS
     3.1 The Client shall pay Rs. 5,00,000 upon signing this agreement.
     3.2 Subsequent payments of Rs. 2,50,000 shall be made monthly.
+    3.3 A bonus of Rs. 5 lakhs and INR 2,50,000 rupees is payable on completion.
     
     4. CONFIDENTIALITY
     All information shared between parties shall be kept strictly confidential.
@@ -407,3 +553,10 @@ if __name__ == "__main__":
         print(f"  - {clause.clause_id}: {clause.title} [{clause.category}]")
         if clause.risk_indicators:
             print(f"    Risk: {clause.risk_indicators}")
+        if clause.amounts:
+            print(f"    Amounts: {clause.amounts}")
+    
+    # Currency amounts keep their unit-suffixed readings ('5 lakhs') as well
+    bonus = extractor.extract_clauses("1. BONUS\nPay Rs. 5 lakhs and INR 2,50,000 rupees on completion.\n")
+    assert bonus[0].amounts == ['Rs. 5', 'INR 2,50,000', '5 lakhs', '2,50,000 rupees'], bonus[0].amounts
+    print(f"Unit amounts: {bonus[0].amounts}")
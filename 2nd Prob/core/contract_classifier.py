@@ -4,11 +4,19 @@ Classifies contracts into different types based on content analysis
 """
 
 import re
+import sys
+from functools import lru_cache
 from typing import Dict, List, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
+from .keyword_matcher import KeywordMatcher
+from .regex_engine import compile_pattern
 
-@dataclass
+# __slots__ for result objects; dataclass(slots=...) needs Python 3.10+
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class ClassificationResult:
     """Result of contract classification"""
     contract_type: str
@@ -42,7 +50,13 @@ class ContractClassifier:
                 r"offer\s+letter",
                 r"service\s+agreement.*employee"
             ],
-            "sub_types": ["Full-time", "Part-time", "Fixed-term", "Probationary", "Executive"]
+            "sub_types": ["Full-time", "Part-time", "Fixed-term", "Probationary", "Executive"],
+            "sub_type_hints": [
+                ("Probationary", ["probation"]),
+                ("Fixed-term", ["fixed term", "fixed-term"]),
+                ("Executive", ["executive", "managing director"])
+            ],
+            "default_sub_type": "Full-time"
         },
         "Vendor Contract": {
             "keywords": [
@@ -72,7 +86,13 @@ class ContractClassifier:
                 r"leave\s+and\s+license",
                 r"property\s+lease"
             ],
-            "sub_types": ["Residential", "Commercial", "Industrial", "Leave and License"]
+            "sub_types": ["Residential", "Commercial", "Industrial", "Leave and License"],
+            "sub_type_hints": [
+                ("Residential", ["residential", "house", "apartment"]),
+                ("Commercial", ["commercial", "office", "shop"]),
+                ("Leave and License", ["leave and license"])
+            ],
+            "default_sub_type": "Commercial"
         },
         "Partnership Deed": {
             "keywords": [
@@ -115,7 +135,11 @@ class ContractClassifier:
                 r"\bnda\b",
                 r"mutual\s+(?:non-disclosure|confidentiality)"
             ],
-            "sub_types": ["Mutual NDA", "One-way NDA", "Employee NDA"]
+            "sub_types": ["Mutual NDA", "One-way NDA", "Employee NDA"],
+            "sub_type_hints": [
+                ("Mutual NDA", ["mutual"])
+            ],
+            "default_sub_type": "One-way NDA"
         },
         "Licensing Agreement": {
             "keywords": [
@@ -175,39 +199,117 @@ class ContractClassifier:
         }
     }
     
+    # (keyword, lower-cased keyword) pairs per contract type, prepared once
+    _TYPE_KEYWORDS = {
+        contract_type: [(keyword, keyword.lower()) for keyword in type_info["keywords"]]
+        for contract_type, type_info in CONTRACT_PATTERNS.items()
+    }
+    
+    # All CONTRACT_PATTERNS keywords (lower-cased), counted in one pass per document
+    _KEYWORD_MATCHER = KeywordMatcher(
+        keyword_lower
+        for keywords in _TYPE_KEYWORDS.values()
+        for _, keyword_lower in keywords
+    )
+    
+    # Highest achievable score per contract type, used to normalize confidence
+    _MAX_POSSIBLE = {
+        contract_type: len(type_info["keywords"]) * 5 + len(type_info["patterns"]) * 10
+        for contract_type, type_info in CONTRACT_PATTERNS.items()
+    }
+    
+    # (pattern, compiled pattern) pairs per contract type
+    _TYPE_PATTERNS = {
+        contract_type: [(pattern, compile_pattern(pattern, re.IGNORECASE)) for pattern in type_info["patterns"]]
+        for contract_type, type_info in CONTRACT_PATTERNS.items()
+    }
+    
+    # One alternation per contract type; a single search rules out every
+    # pattern of a type that does not occur in the document
+    _TYPE_PATTERN_UNIONS = {
+        contract_type: compile_pattern("|".join(f"(?:{pattern})" for pattern in type_info["patterns"]), re.IGNORECASE)
+        for contract_type, type_info in CONTRACT_PATTERNS.items()
+    }
+    
+    # Every pattern of every type, for rejecting non-contract text in one search
+    _ALL_PATTERNS_UNION = compile_pattern(
+        "|".join(f"(?:{pattern})" for type_info in CONTRACT_PATTERNS.values() for pattern in type_info["patterns"]),
+        re.IGNORECASE
+    )
+    
+    # Sub-type names and hint keywords (lower-cased) per contract type, found
+    # in one pass instead of one `in` probe per candidate
+    _SUB_TYPE_MATCHERS = {
+        contract_type: KeywordMatcher(
+            [sub_type.lower() for sub_type in type_info["sub_types"]] +
+            [keyword for _, keywords in type_info.get("sub_type_hints", []) for keyword in keywords]
+        )
+        for contract_type, type_info in CONTRACT_PATTERNS.items()
+    }
+    
     def __init__(self):
         self.result: ClassificationResult = None
     
-    def classify(self, text: str) -> ClassificationResult:
+    def classify(self, text: str, text_lower: str = None) -> ClassificationResult:
         """
         Classify the contract type based on content analysis
         
         Args:
             text: Full contract text
+            text_lower: Pre-computed text.lower(), if the caller already has it
             
         Returns:
             ClassificationResult with type, confidence, and indicators
         """
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
+        
+        # Copy the shared cached result so callers may modify theirs
+        cached = self._classify_cached(text_lower)
+        result = replace(cached, key_indicators=list(cached.key_indicators))
+        
+        # self.result only records the latest call, which may belong to
+        # another session when the classifier is shared
+        self.result = result
+        return result
+    
+    @classmethod
+    @lru_cache(maxsize=32)
+    def _classify_cached(cls, text_lower: str) -> ClassificationResult:
+        """Classify a lower-cased text (shared cached result, do not modify)"""
         scores: Dict[str, Dict] = {}
         
+        # Term frequencies for every keyword, from a single scan of the text
+        keyword_counts = cls._KEYWORD_MATCHER.count(text_lower)
+        
+        # Without any keyword or pattern no type can score; skip the per-type
+        # pattern searches on empty and non-contract text
+        if not keyword_counts and not cls._ALL_PATTERNS_UNION.search(text_lower):
+            return ClassificationResult(
+                contract_type="Unknown",
+                confidence=0.0,
+                sub_type="",
+                key_indicators=[]
+            )
+        
         # Score each contract type
-        for contract_type, type_info in self.CONTRACT_PATTERNS.items():
+        for contract_type, type_info in cls.CONTRACT_PATTERNS.items():
             score = 0
             matched_keywords = []
             
             # Check keywords
-            for keyword in type_info["keywords"]:
-                count = text_lower.count(keyword.lower())
+            for keyword, keyword_lower in cls._TYPE_KEYWORDS[contract_type]:
+                count = keyword_counts.get(keyword_lower, 0)
                 if count > 0:
                     score += min(count, 5)  # Cap contribution per keyword
                     matched_keywords.append(keyword)
             
             # Check patterns (higher weight)
-            for pattern in type_info["patterns"]:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    score += 10
-                    matched_keywords.append(f"[pattern: {pattern[:30]}...]")
+            if cls._TYPE_PATTERN_UNIONS[contract_type].search(text_lower):
+                for pattern, regex in cls._TYPE_PATTERNS[contract_type]:
+                    if regex.search(text_lower):
+                        score += 10
+                        matched_keywords.append(f"[pattern: {pattern[:30]}...]")
             
             if score > 0:
                 scores[contract_type] = {
@@ -216,70 +318,51 @@ class ContractClassifier:
                 }
         
         if not scores:
-            self.result = ClassificationResult(
+            return ClassificationResult(
                 contract_type="Unknown",
                 confidence=0.0,
                 sub_type="",
                 key_indicators=[]
             )
-            return self.result
         
         # Find best match
         best_type = max(scores.keys(), key=lambda x: scores[x]["score"])
         best_score = scores[best_type]["score"]
         
         # Normalize confidence (0-1 scale)
-        max_possible = len(self.CONTRACT_PATTERNS[best_type]["keywords"]) * 5 + \
-                       len(self.CONTRACT_PATTERNS[best_type]["patterns"]) * 10
+        max_possible = cls._MAX_POSSIBLE[best_type]
         confidence = min(1.0, best_score / (max_possible * 0.3))  # 30% of max is high confidence
         
         # Determine sub-type
-        sub_type = self._determine_sub_type(text_lower, best_type)
+        sub_type = cls._determine_sub_type(text_lower, best_type)
         
-        self.result = ClassificationResult(
+        return ClassificationResult(
             contract_type=best_type,
             confidence=round(confidence, 2),
             sub_type=sub_type,
             key_indicators=scores[best_type]["keywords"]
         )
-        
-        return self.result
     
-    def _determine_sub_type(self, text_lower: str, contract_type: str) -> str:
+    @classmethod
+    def _determine_sub_type(cls, text_lower: str, contract_type: str) -> str:
         """Determine the sub-type of the contract"""
-        type_info = self.CONTRACT_PATTERNS.get(contract_type, {})
+        type_info = cls.CONTRACT_PATTERNS.get(contract_type, {})
         sub_types = type_info.get("sub_types", [])
+        matcher = cls._SUB_TYPE_MATCHERS.get(contract_type)
+        found = matcher.find(text_lower) if matcher else set()
         
+        # A sub-type named in the text wins, in sub_types order
         for sub_type in sub_types:
-            if sub_type.lower() in text_lower:
+            if sub_type.lower() in found:
                 return sub_type
         
-        # Special logic for certain types
-        if contract_type == "Employment Agreement":
-            if "probation" in text_lower:
-                return "Probationary"
-            elif "fixed term" in text_lower or "fixed-term" in text_lower:
-                return "Fixed-term"
-            elif "executive" in text_lower or "managing director" in text_lower:
-                return "Executive"
-            else:
-                return "Full-time"
-        
-        elif contract_type == "Lease Agreement":
-            if "residential" in text_lower or "house" in text_lower or "apartment" in text_lower:
-                return "Residential"
-            elif "commercial" in text_lower or "office" in text_lower or "shop" in text_lower:
-                return "Commercial"
-            elif "leave and license" in text_lower:
-                return "Leave and License"
-            else:
-                return "Commercial"
+        # Then the first hint rule with a keyword present
+        for sub_type, keywords in type_info.get("sub_type_hints", []):
+            if not found.isdisjoint(keywords):
+                return sub_type
         
-        elif contract_type == "Non-Disclosure Agreement":
-            if "mutual" in text_lower:
-                return "Mutual NDA"
-            else:
-                return "One-way NDA"
+        if "default_sub_type" in type_info:
+            return type_info["default_sub_type"]
         
         return sub_types[0] if sub_types else ""
     
@@ -301,31 +384,46 @@ class ContractClassifier:
         
         return summary
     
-    def get_all_scores(self, text: str) -> List[Tuple[str, float]]:
+    def get_all_scores(self, text: str, text_lower: str = None) -> List[Tuple[str, float]]:
         """
         Get classification scores for all contract types
         
+        Args:
+            text: Full contract text
+            text_lower: Pre-computed text.lower(), if the caller already has it
+        
         Returns:
             List of (contract_type, score) tuples, sorted by score
         """
-        text_lower = text.lower()
+        if text_lower is None:
+            text_lower = text.lower()
+        return list(self._all_scores_cached(text_lower))
+    
+    @classmethod
+    @lru_cache(maxsize=32)
+    def _all_scores_cached(cls, text_lower: str) -> Tuple[Tuple[str, float], ...]:
+        """Score every contract type for a lower-cased text"""
         scores = []
         
-        for contract_type, type_info in self.CONTRACT_PATTERNS.items():
+        # Keywords present anywhere in the text, from a single scan
+        found_keywords = cls._KEYWORD_MATCHER.find(text_lower)
+        
+        for contract_type in cls.CONTRACT_PATTERNS:
             score = 0
             
-            for keyword in type_info["keywords"]:
-                if keyword.lower() in text_lower:
+            for _, keyword_lower in cls._TYPE_KEYWORDS[contract_type]:
+                if keyword_lower in found_keywords:
                     score += 1
             
-            for pattern in type_info["patterns"]:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    score += 5
+            if cls._TYPE_PATTERN_UNIONS[contract_type].search(text_lower):
+                for _, regex in cls._TYPE_PATTERNS[contract_type]:
+                    if regex.search(text_lower):
+                        score += 5
             
             if score > 0:
                 scores.append((contract_type, score))
         
-        return sorted(scores, key=lambda x: x[1], reverse=True)
+        return tuple(sorted(scores, key=lambda x: x[1], reverse=True))
 
 
 # Quick test
@@ -3,12 +3,24 @@ Document Loader Module
 Handles extraction of text from PDF, DOCX, and TXT files
 """
 
+import io
 import os
 import re
-from typing import Optional, Tuple
+import string
+import zipfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, List, Optional, Tuple, Union
 from pathlib import Path
 
 # PDF Processing
+try:
+    import fitz  # PyMuPDF
+    FITZ_AVAILABLE = True
+except ImportError:
+    FITZ_AVAILABLE = False
+
 try:
     import pdfplumber
     PDF_AVAILABLE = True
@@ -28,6 +40,159 @@ try:
 except ImportError:
     DOCX_AVAILABLE = False
 
+# DOCX XML parsing (lxml ships with python-docx; ElementTree is the stdlib fallback)
+try:
+    from lxml import etree as docx_etree
+except ImportError:
+    import xml.etree.ElementTree as docx_etree
+
+# Text encoding detection
+try:
+    from charset_normalizer import from_bytes
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
+
+# Language detection: Devanagari block vs ASCII letters, counted on UTF-8
+# bytes. U+0900-U+097F encode as E0 A4 xx / E0 A5 xx, and E0 is always a
+# lead byte, so each occurrence of these prefixes is one Devanagari character.
+_DEVANAGARI_UTF8_PREFIXES = (b'\xe0\xa4', b'\xe0\xa5')
+_ASCII_LETTERS = string.ascii_letters.encode('ascii')
+
+# Section headings (ARTICLE/SECTION/CLAUSE n, "1. Title", roman numerals,
+# SCHEDULE/ANNEXURE/EXHIBIT), matched as whole lines in one pass over the
+# text. [^\S\n] is whitespace that stays within the line; surrounding
+# whitespace is ignored, as if each line had been strip()ped.
+_SECTION_HEADING_RE = re.compile(
+    r'^[^\S\n]*(?:'
+    r'(?:ARTICLE|SECTION|CLAUSE)[^\S\n]*[\d\.]+[:\.]?[^\S\n]*.+'
+    r'|\d+\.[^\S\n]+[A-Z](?:[A-Z]|[^\S\n])+'
+    r'|[IVXLC]+\.[^\S\n]+.+'
+    r'|(?:SCHEDULE|ANNEXURE|EXHIBIT)[^\S\n]*[\w\-]*[:\.]?[^\S\n]*.*'
+    r')(?<=\S)[^\S\n]*$',
+    re.MULTILINE | re.IGNORECASE
+)
+
+
+# Word counting works on slices of this many characters
+_WORD_COUNT_CHUNK_CHARS = 64 * 1024
+
+
+def _count_words(text: str) -> int:
+    """
+    Count whitespace-separated words, the same as len(text.split())
+    
+    Splits one slice at a time, so only a slice's worth of word strings
+    exists at once instead of a list of every word in the document.
+    """
+    count = 0
+    previous_ends_in_word = False
+    
+    for start in range(0, len(text), _WORD_COUNT_CHUNK_CHARS):
+        chunk = text[start:start + _WORD_COUNT_CHUNK_CHARS]
+        count += len(chunk.split())
+        
+        # A word cut by the slice boundary was counted in both slices
+        if previous_ends_in_word and not chunk[0].isspace():
+            count -= 1
+        previous_ends_in_word = not chunk[-1].isspace()
+    
+    return count
+
+
+# WordprocessingML tags, in ElementTree's {namespace}name form
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+# Run children that stand for fixed text (w:t and w:br are handled separately)
+_DOCX_RUN_SYMBOLS = {_W + "tab": "\t", _W + "ptab": "\t", _W + "cr": "\n", _W + "noBreakHyphen": "-"}
+
+
+def _docx_paragraph_text(paragraph) -> str:
+    """Text of a w:p element, built from its runs the way python-docx does"""
+    parts = []
+    for child in paragraph:
+        if child.tag == _W + "r":
+            runs = (child,)
+        elif child.tag == _W + "hyperlink":
+            runs = child.iterfind(_W + "r")
+        else:
+            continue
+        
+        for run in runs:
+            for item in run:
+                if item.tag == _W + "t":
+                    parts.append(item.text or "")
+                elif item.tag == _W + "br":
+                    # Page and column breaks carry no text
+                    if item.get(_W + "type", "textWrapping") == "textWrapping":
+                        parts.append("\n")
+                elif item.tag in _DOCX_RUN_SYMBOLS:
+                    parts.append(_DOCX_RUN_SYMBOLS[item.tag])
+    return "".join(parts)
+
+
+def _docx_row_cells(row, previous_cells: List[str]) -> List[str]:
+    """
+    Cell texts of a w:tr element, one per grid column
+    
+    Like python-docx, a cell spanning several columns is repeated for each,
+    and a vertically merged cell repeats the text of the cell above.
+    """
+    cells = []
+    for cell in row.iterfind(_W + "tc"):
+        text = "\n".join(_docx_paragraph_text(p) for p in cell.iterfind(_W + "p"))
+        span, merged = 1, False
+        
+        properties = cell.find(_W + "tcPr")
+        if properties is not None:
+            grid_span = properties.find(_W + "gridSpan")
+            if grid_span is not None:
+                span = int(grid_span.get(_W + "val", "1"))
+            v_merge = properties.find(_W + "vMerge")
+            merged = v_merge is not None and v_merge.get(_W + "val", "continue") == "continue"
+        
+        for _ in range(span):
+            column = len(cells)
+            cells.append(previous_cells[column] if merged and column < len(previous_cells) else text)
+    return cells
+
+
+def _extract_pdf_page_range(data: bytes, start: int, stop: int) -> List[str]:
+    """Extract text from pages [start, stop) of a PDF (runs in a worker process)"""
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return [pdf.pages[i].extract_text() or "" for i in range(start, stop)]
+
+
+# Worker pool shared by every PDF extraction, started on first use
+_PDF_POOL: Optional[ProcessPoolExecutor] = None
+_PDF_POOL_LOCK = threading.Lock()
+
+
+def _pdf_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Return the shared PDF worker pool, creating it if needed
+    
+    Workers come from a forkserver (spawn where that is unavailable), never
+    from forking the host process: the Streamlit server runs other threads,
+    and a fork taken while one of them holds a lock can deadlock the child.
+    """
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None:
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            _PDF_POOL = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+        return _PDF_POOL
+
+
+def _discard_pdf_pool(pool: ProcessPoolExecutor):
+    """Drop a failed pool so the next extraction starts a fresh one"""
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is pool:
+            _PDF_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
 
 class DocumentLoader:
     """
@@ -36,6 +201,15 @@ class DocumentLoader:
     
     SUPPORTED_EXTENSIONS = ['.pdf', '.docx', '.doc', '.txt']
     
+    # PDFs with at least this many pages are split across worker processes;
+    # smaller ones are not worth the process start-up
+    PARALLEL_PDF_MIN_PAGES = 4
+    MAX_PDF_WORKERS = 8
+    
+    # Text files larger than this have their encoding detected from a prefix
+    TXT_FULL_DETECT_BYTES = 8 * 1024 * 1024
+    TXT_PROBE_BYTES = 64 * 1024
+    
     def __init__(self):
         self.text = ""
         self.metadata = {}
@@ -47,36 +221,49 @@ class DocumentLoader:
         
         Args:
             file_path: Path to the document file
-            
+        
         Returns:
             Tuple of (extracted_text, metadata)
         """
         path = Path(file_path)
-        extension = path.suffix.lower()
+        extension = self._check_extension(path.name)
         
-        if extension not in self.SUPPORTED_EXTENSIONS:
-            raise ValueError(f"Unsupported file format: {extension}")
-        
-        self.metadata = {
+        metadata = {
             "filename": path.name,
             "extension": extension,
             "size_bytes": path.stat().st_size if path.exists() else 0
         }
         
-        if extension == '.pdf':
-            self.text = self._extract_pdf(file_path)
-        elif extension in ['.docx', '.doc']:
-            self.text = self._extract_docx(file_path)
-        elif extension == '.txt':
-            self.text = self._extract_txt(file_path)
+        return self._extract(file_path, extension, metadata)
+    
+    def load_from_stream(self, file_obj: BinaryIO, filename: str) -> Tuple[str, dict]:
+        """
+        Load document from a binary file-like object (e.g. Streamlit UploadedFile)
         
-        # Detect language
-        self.language = self._detect_language(self.text)
-        self.metadata["language"] = self.language
-        self.metadata["char_count"] = len(self.text)
-        self.metadata["word_count"] = len(self.text.split())
+        The stream is handed straight to the PDF/DOCX readers, so the upload
+        is never copied into a separate bytes object or a temp file.
+        
+        Args:
+            file_obj: Seekable binary stream with the file content
+            filename: Original filename (used to pick the extractor)
+        
+        Returns:
+            Tuple of (extracted_text, metadata)
+        """
+        extension = self._check_extension(filename)
+        
+        size = getattr(file_obj, "size", None)
+        if size is None:
+            file_obj.seek(0, os.SEEK_END)
+            size = file_obj.tell()
         
-        return self.text, self.metadata
+        metadata = {
+            "filename": Path(filename).name,
+            "extension": extension,
+            "size_bytes": size
+        }
+        
+        return self._extract(file_obj, extension, metadata)
     
     def load_from_bytes(self, file_bytes: bytes, filename: str) -> Tuple[str, dict]:
         """
@@ -85,39 +272,92 @@ class DocumentLoader:
         Args:
             file_bytes: File content as bytes
             filename: Original filename
-            
+        
         Returns:
             Tuple of (extracted_text, metadata)
         """
-        import tempfile
-        
+        return self.load_from_stream(io.BytesIO(file_bytes), filename)
+    
+    def _check_extension(self, filename: str) -> str:
+        """Return the lower-cased extension, raising if it is unsupported"""
         extension = Path(filename).suffix.lower()
         
-        # Write to temp file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp:
-            tmp.write(file_bytes)
-            tmp_path = tmp.name
+        if extension not in self.SUPPORTED_EXTENSIONS:
+            raise ValueError(f"Unsupported file format: {extension}")
         
-        try:
-            return self.load(tmp_path)
-        finally:
-            # Cleanup temp file
-            os.unlink(tmp_path)
+        return extension
     
-    def _extract_pdf(self, file_path: str) -> str:
-        """Extract text from PDF file"""
-        text_parts = []
+    def _extract(self, source: Union[str, BinaryIO], extension: str, metadata: dict) -> Tuple[str, dict]:
+        """Run the extractor for the extension and fill in text statistics"""
+        # Text and metadata stay local until the end, so a shared (cached)
+        # loader never returns another call's document or page count
+        text = ""
+        if extension == '.pdf':
+            text = self._extract_pdf(source, metadata)
+        elif extension in ['.docx', '.doc']:
+            text = self._extract_docx(source, metadata)
+        elif extension == '.txt':
+            text = self._extract_txt(source)
         
-        # Try pdfplumber first (better for complex PDFs)
-        if PDF_AVAILABLE:
+        # Detect language
+        language = self._detect_language(text)
+        metadata["language"] = language
+        metadata["char_count"] = len(text)
+        metadata["word_count"] = _count_words(text)
+        
+        self.text, self.metadata, self.language = text, metadata, language
+        return text, metadata
+    
+    @staticmethod
+    def _rewind(source: Union[str, BinaryIO]):
+        """Seek a stream source back to the start before (re)reading it"""
+        if hasattr(source, "seek"):
+            source.seek(0)
+    
+    def _extract_pdf(self, source: Union[str, BinaryIO], metadata: dict) -> str:
+        """Extract text from PDF file path or stream, recording page_count in metadata"""
+        # Each backend collects its pages in its own list, so a backend that
+        # fails partway through leaves nothing behind for the next one
+        
+        # Try PyMuPDF first (C library, several times faster than pdfminer,
+        # keeps reading order on multi-column pages)
+        if FITZ_AVAILABLE:
             try:
-                with pdfplumber.open(file_path) as pdf:
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
+                if hasattr(source, "read"):
+                    self._rewind(source)
+                    doc = fitz.open(stream=source.read(), filetype="pdf")
+                else:
+                    doc = fitz.open(source)
+                
+                text_parts = []
+                with doc:
+                    for page in doc:
+                        page_text = page.get_text("text")
+                        if page_text.strip():
                             text_parts.append(page_text)
                     
-                    self.metadata["page_count"] = len(pdf.pages)
+                    metadata["page_count"] = doc.page_count
+                
+                if text_parts:
+                    return "\n\n".join(text_parts)
+            except Exception as e:
+                print(f"PyMuPDF failed: {e}, trying pdfplumber...")
+        
+        # Then pdfplumber (better for complex PDFs than PyPDF2)
+        if PDF_AVAILABLE:
+            try:
+                self._rewind(source)
+                with pdfplumber.open(source) as pdf:
+                    page_count = len(pdf.pages)
+                    
+                    page_texts = None
+                    if page_count >= self.PARALLEL_PDF_MIN_PAGES:
+                        page_texts = self._extract_pdf_parallel(source, page_count)
+                    if page_texts is None:
+                        page_texts = [page.extract_text() for page in pdf.pages]
+                    
+                    text_parts = [page_text for page_text in page_texts if page_text]
+                    metadata["page_count"] = page_count
                 
                 if text_parts:
                     return "\n\n".join(text_parts)
@@ -127,26 +367,78 @@ class DocumentLoader:
         # Fallback to PyPDF2
         if PYPDF2_AVAILABLE:
             try:
-                reader = PdfReader(file_path)
+                self._rewind(source)
+                reader = PdfReader(source)
+                text_parts = []
                 for page in reader.pages:
                     page_text = page.extract_text()
                     if page_text:
                         text_parts.append(page_text)
                 
-                self.metadata["page_count"] = len(reader.pages)
+                metadata["page_count"] = len(reader.pages)
                 return "\n\n".join(text_parts)
             except Exception as e:
                 raise RuntimeError(f"Failed to extract PDF text: {e}")
         
-        raise RuntimeError("No PDF library available. Install pdfplumber or PyPDF2.")
+        raise RuntimeError("No PDF library available. Install PyMuPDF, pdfplumber or PyPDF2.")
+    
+    def _extract_pdf_parallel(self, source: Union[str, BinaryIO], page_count: int) -> Optional[List[str]]:
+        """
+        Extract PDF pages with pdfplumber in the shared process pool
+        
+        pdfminer's layout analysis is CPU-bound Python, so pages are split
+        into contiguous ranges, one per worker, and each worker reopens the
+        PDF from its bytes.
+        
+        Returns:
+            Page texts in page order, or None to fall back to serial extraction
+        """
+        max_workers = min(os.cpu_count() or 1, self.MAX_PDF_WORKERS)
+        workers = min(max_workers, page_count)
+        if workers < 2:
+            return None
+        
+        pool = None
+        try:
+            if hasattr(source, "read"):
+                # pdfplumber is still reading this stream; restore its position
+                position = source.tell()
+                source.seek(0)
+                data = source.read()
+                source.seek(position)
+            else:
+                with open(source, 'rb') as f:
+                    data = f.read()
+            
+            step = -(-page_count // workers)  # ceil division
+            pool = _pdf_pool(max_workers)
+            futures = [
+                pool.submit(_extract_pdf_page_range, data, start, min(start + step, page_count))
+                for start in range(0, page_count, step)
+            ]
+            return [page_text for future in futures for page_text in future.result()]
+        except Exception as e:
+            print(f"Parallel PDF extraction failed: {e}, extracting pages serially...")
+            if pool is not None:
+                _discard_pdf_pool(pool)
+            return None
     
-    def _extract_docx(self, file_path: str) -> str:
-        """Extract text from DOCX file"""
-        if not DOCX_AVAILABLE:
-            raise RuntimeError("python-docx not installed. Run: pip install python-docx")
+    def _extract_docx(self, source: Union[str, BinaryIO], metadata: dict) -> str:
+        """Extract text from DOCX file path or stream, recording paragraph_count in metadata"""
+        # Read word/document.xml directly: one C-level parse instead of a
+        # python-docx wrapper object per paragraph, run and cell
+        try:
+            self._rewind(source)
+            paragraphs = self._extract_docx_xml(source)
+            metadata["paragraph_count"] = len(paragraphs)
+            return "\n\n".join(paragraphs)
+        except Exception as e:
+            if not DOCX_AVAILABLE:
+                raise RuntimeError(f"Failed to extract DOCX text: {e}")
         
         try:
-            doc = Document(file_path)
+            self._rewind(source)
+            doc = Document(source)
             paragraphs = []
             
             for para in doc.paragraphs:
@@ -160,21 +452,74 @@ class DocumentLoader:
                     if row_text:
                         paragraphs.append(row_text)
             
-            self.metadata["paragraph_count"] = len(paragraphs)
+            metadata["paragraph_count"] = len(paragraphs)
             return "\n\n".join(paragraphs)
-            
+        
         except Exception as e:
             raise RuntimeError(f"Failed to extract DOCX text: {e}")
     
-    def _extract_txt(self, file_path: str) -> str:
-        """Extract text from TXT file"""
+    @staticmethod
+    def _extract_docx_xml(source: Union[str, BinaryIO]) -> List[str]:
+        """
+        Extract non-empty body paragraphs, then table rows, from a DOCX
+        
+        Mirrors the python-docx based extraction: body-level paragraphs in
+        order, followed by each body-level table row as " | "-joined cells.
+        """
+        with zipfile.ZipFile(source) as archive:
+            with archive.open("word/document.xml") as xml_file:
+                root = docx_etree.parse(xml_file).getroot()
+        
+        body = root.find(_W + "body")
+        if body is None:
+            raise ValueError("word/document.xml has no w:body")
+        
+        paragraphs = []
+        for paragraph in body.iterfind(_W + "p"):
+            text = _docx_paragraph_text(paragraph)
+            if text.strip():
+                paragraphs.append(text)
+        
+        # Also extract from tables
+        for table in body.iterfind(_W + "tbl"):
+            previous_cells = []
+            for row in table.iterfind(_W + "tr"):
+                cells = _docx_row_cells(row, previous_cells)
+                previous_cells = cells
+                row_text = " | ".join(cell.strip() for cell in cells if cell.strip())
+                if row_text:
+                    paragraphs.append(row_text)
+        
+        return paragraphs
+    
+    def _extract_txt(self, source: Union[str, BinaryIO]) -> str:
+        """Extract text from TXT file path or stream"""
         encodings = ['utf-8', 'utf-16', 'latin-1', 'cp1252']
         
-        for encoding in encodings:
+        if hasattr(source, "read"):
+            self._rewind(source)
+            raw = source.read()
+        else:
+            with open(source, 'rb') as f:
+                raw = f.read()
+        
+        # TextIOWrapper keeps the universal-newline handling of open()
+        try:
+            return io.TextIOWrapper(io.BytesIO(raw), encoding='utf-8').read()
+        except UnicodeDecodeError:
+            pass
+        
+        # Not UTF-8: detect the encoding once instead of trial-decoding
+        if CHARSET_NORMALIZER_AVAILABLE:
+            probe = raw if len(raw) <= self.TXT_FULL_DETECT_BYTES else raw[:self.TXT_PROBE_BYTES]
+            best = from_bytes(probe).best()
+            if best is not None:
+                return io.TextIOWrapper(io.BytesIO(raw), encoding=best.encoding, errors='replace').read()
+        
+        for encoding in encodings[1:]:
             try:
-                with open(file_path, 'r', encoding=encoding) as f:
-                    return f.read()
-            except UnicodeDecodeError:
+                return io.TextIOWrapper(io.BytesIO(raw), encoding=encoding).read()
+            except UnicodeError:  # utf-16 without a BOM raises plain UnicodeError
                 continue
         
         raise RuntimeError("Failed to read text file with any known encoding")
@@ -183,19 +528,28 @@ class DocumentLoader:
         """
         Detect if text is primarily English or Hindi
         
+        Computed once per document in _extract and stored in
+        metadata["language"]; callers should read it from there.
+        
         Returns:
             'en' for English, 'hi' for Hindi, 'mixed' for bilingual
         """
         if not text:
             return "en"
         
+        # Count in C over the encoded bytes instead of building a list of
+        # every matching character
+        data = text.encode('utf-8', 'surrogatepass')
+        
         # Hindi Unicode range: \u0900-\u097F (Devanagari)
-        hindi_pattern = re.compile(r'[\u0900-\u097F]')
-        hindi_chars = len(hindi_pattern.findall(text))
+        hindi_chars = sum(data.count(prefix) for prefix in _DEVANAGARI_UTF8_PREFIXES)
+        
+        # No Devanagari at all means English; skip counting every letter
+        if hindi_chars == 0:
+            return "en"
         
-        # English/ASCII pattern
-        english_pattern = re.compile(r'[a-zA-Z]')
-        english_chars = len(english_pattern.findall(text))
+        # English/ASCII letters: whatever translate() deletes
+        english_chars = len(data) - len(data.translate(None, _ASCII_LETTERS))
         
         total = hindi_chars + english_chars
         if total == 0:
@@ -217,39 +571,22 @@ class DocumentLoader:
         Returns:
             List of (heading, content) tuples
         """
-        # Common section patterns in contracts
-        section_patterns = [
-            r'^(?:ARTICLE|Article|SECTION|Section|CLAUSE|Clause)\s*[\d\.]+[:\.]?\s*(.+)$',
-            r'^\d+\.\s+([A-Z][A-Za-z\s]+)$',
-            r'^[IVXLC]+\.\s+(.+)$',
-            r'^(?:SCHEDULE|Schedule|ANNEXURE|Annexure|EXHIBIT|Exhibit)\s*[\w\-]*[:\.]?\s*(.*)$'
-        ]
-        
-        combined_pattern = '|'.join(f'({p})' for p in section_patterns)
-        
-        lines = text.split('\n')
         sections = []
         current_heading = "Introduction"
-        current_content = []
-        
-        for line in lines:
-            is_heading = False
-            for pattern in section_patterns:
-                if re.match(pattern, line.strip(), re.IGNORECASE):
-                    # Save previous section
-                    if current_content:
-                        sections.append((current_heading, '\n'.join(current_content)))
-                    current_heading = line.strip()
-                    current_content = []
-                    is_heading = True
-                    break
-            
-            if not is_heading:
-                current_content.append(line)
         
-        # Add last section
-        if current_content:
-            sections.append((current_heading, '\n'.join(current_content)))
+        # Start of the first line after the current heading
+        position = 0
+        
+        for match in _SECTION_HEADING_RE.finditer(text):
+            # Save previous section if at least one line separates the headings
+            if match.start() > position:
+                sections.append((current_heading, text[position:match.start() - 1]))
+            current_heading = match.group().strip()
+            position = match.end() + 1
+        
+        # Add last section (heading lines are followed by a newline, if any)
+        if position <= len(text):
+            sections.append((current_heading, text[position:]))
         
         return sections
 
@@ -0,0 +1,114 @@
+"""
+Keyword Matcher Module
+Finds many literal keywords in a text with a single scan
+"""
+
+from typing import Dict, Iterable, Iterator, Set, Tuple
+
+# Aho-Corasick automaton (optional, pip install pyahocorasick)
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class KeywordMatcher:
+    """
+    Multi-keyword substring matcher
+    
+    Uses one Aho-Corasick pass over the text when pyahocorasick is installed,
+    otherwise falls back to one str.count / `in` check per keyword. Both
+    backends return the same results.
+    """
+    
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Build the matcher
+        
+        Args:
+            keywords: Literal keywords to look for (matched case-sensitively,
+                      so pass lower-cased keywords for lower-cased text)
+        """
+        self.keywords = [keyword for keyword in dict.fromkeys(keywords) if keyword]
+        self._automaton = None
+        
+        if AHOCORASICK_AVAILABLE and self.keywords:
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+    
+    def count(self, text: str) -> Dict[str, int]:
+        """
+        Count occurrences of each keyword
+        
+        Counts are non-overlapping, i.e. the same as text.count(keyword).
+        
+        Returns:
+            Dictionary of keyword -> count, for keywords found at least once
+        """
+        counts: Dict[str, int] = {}
+        
+        if self._automaton is None:
+            for keyword in self.keywords:
+                count = text.count(keyword)
+                if count:
+                    counts[keyword] = count
+            return counts
+        
+        # The automaton reports every (possibly overlapping) hit in order of
+        # end position; keep only hits starting after the previous one ended
+        next_start: Dict[str, int] = {}
+        for end, keyword in self._automaton.iter(text):
+            start = end - len(keyword) + 1
+            if start >= next_start.get(keyword, 0):
+                counts[keyword] = counts.get(keyword, 0) + 1
+                next_start[keyword] = end + 1
+        
+        return counts
+    
+    def find(self, text: str) -> Set[str]:
+        """
+        Find which keywords occur in the text
+        
+        Returns:
+            Set of keywords present at least once
+        """
+        if self._automaton is None:
+            return {keyword for keyword in self.keywords if keyword in text}
+        
+        return {keyword for _, keyword in self._automaton.iter(text)}
+    
+    def finditer(self, text: str) -> Iterator[Tuple[int, str]]:
+        """
+        Iterate over keyword occurrences
+        
+        Yields (start, keyword) pairs. Different keywords may overlap; the
+        order of the pairs is not specified.
+        """
+        if self._automaton is None:
+            for keyword in self.keywords:
+                start = text.find(keyword)
+                while start != -1:
+                    yield start, keyword
+                    start = text.find(keyword, start + len(keyword))
+            return
+        
+        for end, keyword in self._automaton.iter(text):
+            yield end - len(keyword) + 1, keyword
+
+
+# Quick test
+if __name__ == "__main__":
+    matcher = KeywordMatcher(["employ", "employee", "salary", "notice"])
+    
+    print("Keyword Matcher Module")
+    print("=" * 50)
+    print(f"Aho-Corasick backend: {AHOCORASICK_AVAILABLE}")
+    
+    sample = "the employee shall give notice. the employer pays the employee a salary."
+    print(f"Counts: {matcher.count(sample)}")
+    print(f"Found: {sorted(matcher.find(sample))}")
+    print(f"Positions: {sorted(matcher.finditer(sample))}")
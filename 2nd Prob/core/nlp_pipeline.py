@@ -4,9 +4,14 @@ Handles tokenization, NER, and linguistic analysis using spaCy and NLTK
 """
 
 import re
+from bisect import bisect_right
+from itertools import islice
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
 
+from .keyword_matcher import KeywordMatcher
+from .regex_engine import compile_pattern
+
 # Try to import spaCy
 try:
     import spacy
@@ -23,6 +28,9 @@ try:
 except ImportError:
     NLTK_AVAILABLE = False
 
+# Numbered clause headers ("1.", "2.1:", "3)") followed by a title line
+_CLAUSE_HEADER_RE = re.compile(r'(?:^|\n)\s*(\d+(?:\.\d+)*)\s*[\.:\)]\s*([^\n]+)')
+
 
 @dataclass
 class Entity:
@@ -78,6 +86,18 @@ class NLPPipeline:
         ]
     }
     
+    # LEGAL_PATTERNS compiled once when the class is created
+    _LEGAL_REGEXES = {
+        category: [compile_pattern(pattern, re.IGNORECASE) for pattern in patterns]
+        for category, patterns in LEGAL_PATTERNS.items()
+    }
+    
+    # Date and amount patterns fused into one alternation each, so every
+    # category is a single scan of the text. Each pattern has one capture
+    # group, so match.lastindex points at the value of whichever one matched.
+    _DATE_SCAN_RE = compile_pattern("|".join(f"(?:{p})" for p in LEGAL_PATTERNS["date"]), re.IGNORECASE)
+    _AMOUNT_SCAN_RE = compile_pattern("|".join(f"(?:{p})" for p in LEGAL_PATTERNS["amount"]), re.IGNORECASE)
+    
     # Obligation/Right/Prohibition indicators
     OBLIGATION_KEYWORDS = [
         "shall", "must", "will", "agrees to", "undertakes to", "obligated to",
@@ -94,6 +114,30 @@ class NLPPipeline:
         "restricted from", "is not allowed to", "is forbidden to"
     ]
     
+    # Legal keywords reported by get_key_terms
+    LEGAL_TERMS = [
+        "indemnify", "liability", "termination", "confidential", "proprietary",
+        "arbitration", "jurisdiction", "warranty", "breach", "damages",
+        "force majeure", "assignment", "notice", "amendment", "waiver",
+        "governing law", "intellectual property", "non-compete", "non-disclosure",
+        "severability", "entire agreement", "counterparts"
+    ]
+    
+    _LEGAL_TERMS_MATCHER = KeywordMatcher(LEGAL_TERMS)
+    
+    # Character limits for spaCy entities and party names (performance)
+    ENTITY_CHAR_LIMIT = 100000
+    PARTY_ENTITY_CHAR_LIMIT = 50000
+    
+    # Amounts reported by process()
+    MAX_AMOUNTS = 30
+    
+    # spaCy components whose output the pipeline never reads
+    _UNUSED_PIPES = ("lemmatizer",)
+    
+    # All intent keywords, found in one scan per sentence
+    _INTENT_MATCHER = KeywordMatcher(PROHIBITION_KEYWORDS + OBLIGATION_KEYWORDS + RIGHT_KEYWORDS)
+    
     def __init__(self, use_spacy: bool = True):
         """
         Initialize NLP pipeline
@@ -143,20 +187,27 @@ class NLPPipeline:
             "prohibitions": []
         }
         
+        # Nothing to find in blank text; skip spaCy and the pattern scans
+        if not text or text.isspace():
+            return result
+        
+        # One spaCy pass, shared by sentences, entities and parties
+        doc = self._parse(text)
+        
         # Extract sentences
-        result["sentences"] = self._extract_sentences(text)
+        result["sentences"] = self._extract_sentences(text, doc)
         
         # Extract named entities
-        result["entities"] = self._extract_entities(text)
+        result["entities"] = self._extract_entities(text, doc)
         
         # Extract legal-specific entities using patterns
-        result["parties"] = self._extract_parties(text)
+        result["parties"] = self._extract_parties(text, doc)
         result["dates"] = self._extract_dates(text)
         result["amounts"] = self._extract_amounts(text)
         
         # Classify sentence intent (obligation/right/prohibition)
-        for sentence in result["sentences"]:
-            classification = self._classify_sentence_intent(sentence)
+        classifications = self._classify_sentences(result["sentences"])
+        for sentence, classification in zip(result["sentences"], classifications):
             if classification["type"] == "obligation":
                 result["obligations"].append(sentence)
             elif classification["type"] == "right":
@@ -166,24 +217,36 @@ class NLPPipeline:
         
         return result
     
-    def _extract_sentences(self, text: str) -> List[str]:
-        """Extract sentences from text"""
+    def _parse(self, text: str):
+        """Run spaCy over the text, or return None when spaCy is not in use"""
         if self.use_spacy and self.nlp:
-            doc = self.nlp(text)
-            return [sent.text.strip() for sent in doc.sents if sent.text.strip()]
+            return self.nlp(text, disable=self._UNUSED_PIPES)
+        return None
+    
+    def _extract_sentences(self, text: str, doc=None) -> List[str]:
+        """Extract sentences from text (doc: spaCy parse of text, if already made)"""
+        if self.use_spacy and self.nlp:
+            if doc is None:
+                doc = self._parse(text)
+            # Each span's text is built and stripped once
+            stripped = (sent.text.strip() for sent in doc.sents)
+            return [sentence for sentence in stripped if sentence]
         elif NLTK_AVAILABLE:
             return sent_tokenize(text)
         else:
             # Simple fallback
             return [s.strip() for s in re.split(r'[.!?]+', text) if s.strip()]
     
-    def _extract_entities(self, text: str) -> List[Entity]:
-        """Extract named entities using spaCy"""
+    def _extract_entities(self, text: str, doc=None) -> List[Entity]:
+        """Extract named entities using spaCy (doc: parse of text, if already made)"""
         entities = []
         
         if self.use_spacy and self.nlp:
-            doc = self.nlp(text[:100000])  # Limit for performance
+            if doc is None:
+                doc = self._parse(text[:self.ENTITY_CHAR_LIMIT])  # Limit for performance
             for ent in doc.ents:
+                if ent.end_char > self.ENTITY_CHAR_LIMIT:
+                    break
                 entities.append(Entity(
                     text=ent.text,
                     label=ent.label_,
@@ -193,35 +256,32 @@ class NLPPipeline:
         
         return entities
     
-    def _extract_parties(self, text: str) -> List[str]:
-        """Extract party names from contract"""
-        parties = set()
-        
-        for pattern in self.LEGAL_PATTERNS["party"]:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            for match in matches:
-                if isinstance(match, tuple):
-                    match = match[0]
-                cleaned = match.strip().strip('"\'')
-                if len(cleaned) > 2 and len(cleaned) < 100:
-                    parties.add(cleaned)
+    def _extract_parties(self, text: str, doc=None) -> List[str]:
+        """Extract party names from contract (doc: spaCy parse of text, if already made)"""
+        # Each party pattern has a single capture group holding the name
+        candidates = (
+            match.group(1).strip().strip('"\'')
+            for pattern in self._LEGAL_REGEXES["party"]
+            for match in pattern.finditer(text)
+        )
+        
+        # dict keys dedupe while keeping the order parties were found in
+        parties = dict.fromkeys(cleaned for cleaned in candidates if 2 < len(cleaned) < 100)
         
         # Also extract from spaCy ORG entities
         if self.use_spacy and self.nlp:
-            doc = self.nlp(text[:50000])
-            for ent in doc.ents:
-                if ent.label_ in ["ORG", "PERSON"]:
-                    parties.add(ent.text)
-        
-        return list(parties)[:10]  # Limit to top 10
+            if doc is None:
+                doc = self._parse(text[:self.PARTY_ENTITY_CHAR_LIMIT])
+            parties.update(dict.fromkeys(
+                ent.text for ent in doc.ents
+                if ent.label_ in ("ORG", "PERSON") and ent.end_char <= self.PARTY_ENTITY_CHAR_LIMIT
+            ))
+        
+        return list(islice(parties, 10))  # Limit to top 10
     
     def _extract_dates(self, text: str) -> List[str]:
         """Extract dates from contract"""
-        dates = []
-        
-        for pattern in self.LEGAL_PATTERNS["date"]:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            dates.extend(matches)
+        dates = [match.group(match.lastindex) for match in self._DATE_SCAN_RE.finditer(text)]
         
         return list(set(dates))[:20]  # Limit and dedupe
     
@@ -229,15 +289,16 @@ class NLPPipeline:
         """Extract monetary amounts from contract"""
         amounts = []
         
-        for pattern in self.LEGAL_PATTERNS["amount"]:
-            matches = re.finditer(pattern, text, re.IGNORECASE)
-            for match in matches:
-                amounts.append({
-                    "value": match.group(1) if match.groups() else match.group(),
-                    "context": text[max(0, match.start()-50):match.end()+50]
-                })
+        # Matches come in document order; an amount written as both
+        # "Rs. 5,000" and "5,000 rupees" is reported once. The scan stops
+        # at the limit, so later amounts are never matched or sliced.
+        for match in islice(self._AMOUNT_SCAN_RE.finditer(text), self.MAX_AMOUNTS):
+            amounts.append({
+                "value": match.group(match.lastindex),
+                "context": text[max(0, match.start()-50):match.end()+50]
+            })
         
-        return amounts[:30]  # Limit
+        return amounts
     
     def _classify_sentence_intent(self, sentence: str) -> Dict[str, Any]:
         """
@@ -246,21 +307,56 @@ class NLPPipeline:
         Returns:
             Dictionary with type and confidence
         """
-        sentence_lower = sentence.lower()
+        return self._intent_from_keywords(self._INTENT_MATCHER.find(sentence.lower()))
+    
+    def _classify_sentences(self, sentences: List[str]) -> List[Dict[str, Any]]:
+        """
+        Classify many sentences with one keyword scan
+        
+        The sentences are joined and lower-cased once; keyword hits are
+        mapped back to their sentence by offset.
+        
+        Returns:
+            One _classify_sentence_intent result per sentence
+        """
+        joined = "\n".join(sentences)
+        joined_lower = joined.lower()
+        
+        # A few characters lower-case to several, which would shift offsets
+        if len(joined_lower) != len(joined):
+            return [self._classify_sentence_intent(sentence) for sentence in sentences]
+        
+        starts = []
+        offset = 0
+        for sentence in sentences:
+            starts.append(offset)
+            offset += len(sentence) + 1
+        
+        # Keywords never contain "\n", so no hit spans two sentences
+        found = [set() for _ in sentences]
+        for start, keyword in self._INTENT_MATCHER.finditer(joined_lower):
+            found[bisect_right(starts, start) - 1].add(keyword)
+        
+        return [self._intent_from_keywords(keywords) for keywords in found]
+    
+    def _intent_from_keywords(self, found) -> Dict[str, Any]:
+        """Classify a sentence from the set of intent keywords it contains"""
+        if not found:
+            return {"type": "neutral", "confidence": 0.5, "keyword": None}
         
         # Check prohibitions first (they often contain obligation words)
         for keyword in self.PROHIBITION_KEYWORDS:
-            if keyword in sentence_lower:
+            if keyword in found:
                 return {"type": "prohibition", "confidence": 0.9, "keyword": keyword}
         
         # Check obligations
         for keyword in self.OBLIGATION_KEYWORDS:
-            if keyword in sentence_lower:
+            if keyword in found:
                 return {"type": "obligation", "confidence": 0.85, "keyword": keyword}
         
         # Check rights
         for keyword in self.RIGHT_KEYWORDS:
-            if keyword in sentence_lower:
+            if keyword in found:
                 return {"type": "right", "confidence": 0.85, "keyword": keyword}
         
         return {"type": "neutral", "confidence": 0.5, "keyword": None}
@@ -274,10 +370,7 @@ class NLPPipeline:
         """
         clauses = []
         
-        # Pattern for clause headers
-        clause_pattern = r'(?:^|\n)\s*(\d+(?:\.\d+)*)\s*[\.:\)]\s*([^\n]+)'
-        
-        matches = list(re.finditer(clause_pattern, text))
+        matches = list(_CLAUSE_HEADER_RE.finditer(text))
         
         for i, match in enumerate(matches):
             clause_num = match.group(1)
@@ -310,23 +403,10 @@ class NLPPipeline:
         Returns:
             List of important terms
         """
-        # Legal keywords to look for
-        legal_terms = [
-            "indemnify", "liability", "termination", "confidential", "proprietary",
-            "arbitration", "jurisdiction", "warranty", "breach", "damages",
-            "force majeure", "assignment", "notice", "amendment", "waiver",
-            "governing law", "intellectual property", "non-compete", "non-disclosure",
-            "severability", "entire agreement", "counterparts"
-        ]
-        
-        found_terms = []
-        text_lower = text.lower()
-        
-        for term in legal_terms:
-            if term in text_lower:
-                found_terms.append(term)
+        # One scan for all terms; report them in LEGAL_TERMS order
+        found = self._LEGAL_TERMS_MATCHER.find(text.lower())
         
-        return found_terms
+        return [term for term in self.LEGAL_TERMS if term in found]
 
 
 # Quick test
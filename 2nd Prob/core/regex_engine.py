@@ -0,0 +1,133 @@
+"""
+Regex Engine Module
+Compiles patterns with google-re2 (linear-time matching) when it is installed,
+falling back to the standard re module
+"""
+
+import re
+from typing import Optional
+
+# RE2 engine (optional, pip install google-re2)
+try:
+    import re2
+    RE2_AVAILABLE = True
+except ImportError:
+    RE2_AVAILABLE = False
+
+# re flags that RE2 understands, as inline flag letters
+_INLINE_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"))
+_SUPPORTED_FLAGS = re.IGNORECASE | re.MULTILINE | re.DOTALL
+
+# Python's Unicode \s, spelled as an RE2 class body (RE2's own \s is ASCII only)
+_RE2_SPACE = r"\s\x{0b}\x{1c}-\x{1f}\x{85}\p{Z}"
+
+# Escapes whose RE2 meaning differs from re (ASCII-only \b, \w) or that RE2 lacks
+_RE_ONLY_ESCAPES = set("bBwWDSZ0123456789")
+
+
+def _to_re2_syntax(pattern: str, flags: int = 0) -> Optional[str]:
+    """
+    Rewrite a re pattern so RE2 matches the same text
+    
+    \\d and \\s are widened to their Unicode meaning. Patterns relying on
+    escapes RE2 treats differently (\\b, \\w, backreferences, ...), on
+    lookaround, or on a bare $ without MULTILINE (re's $ also matches before
+    a trailing newline, RE2's only at the very end) return None and stay on re.
+    
+    Args:
+        pattern: Regular expression in re syntax
+        flags: re flags the pattern will be compiled with
+    
+    Returns:
+        RE2 pattern string, or None if the pattern should use re
+    """
+    if "(?=" in pattern or "(?!" in pattern or "(?<=" in pattern or "(?<!" in pattern:
+        return None
+    
+    parts = []
+    in_class = False
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        
+        if char == "\\" and i + 1 < len(pattern):
+            escape = pattern[i + 1]
+            if escape in _RE_ONLY_ESCAPES:
+                return None
+            if escape == "d":
+                parts.append(r"\p{Nd}")
+            elif escape == "s":
+                parts.append(_RE2_SPACE if in_class else f"[{_RE2_SPACE}]")
+            else:
+                parts.append(pattern[i:i + 2])
+            i += 2
+            continue
+        
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "$" and not flags & re.MULTILINE:
+            return None
+        elif char == "[":
+            in_class = True
+            parts.append(char)
+            i += 1
+            # A leading ^ and a ] right after the opening bracket are literal
+            if i < len(pattern) and pattern[i] == "^":
+                parts.append("^")
+                i += 1
+            if i < len(pattern) and pattern[i] == "]":
+                parts.append("]")
+                i += 1
+            continue
+        
+        parts.append(char)
+        i += 1
+    
+    return "".join(parts)
+
+
+def compile_pattern(pattern: str, flags: int = 0):
+    """
+    Compile a pattern with RE2 when possible, otherwise with re
+    
+    RE2 runs in time linear in the input, so contract text cannot trigger
+    catastrophic backtracking in the patterns it accepts. The returned
+    object has the usual search/finditer/findall/sub API either way.
+    
+    Args:
+        pattern: Regular expression in re syntax
+        flags: re flags (IGNORECASE, MULTILINE and DOTALL carry over to RE2)
+    
+    Returns:
+        Compiled pattern object
+    """
+    if RE2_AVAILABLE and not flags & ~_SUPPORTED_FLAGS:
+        re2_pattern = _to_re2_syntax(pattern, flags)
+        if re2_pattern is not None:
+            inline = "".join(letter for flag, letter in _INLINE_FLAGS if flags & flag)
+            if inline:
+                re2_pattern = f"(?{inline}){re2_pattern}"
+            try:
+                return re2.compile(re2_pattern)
+            except Exception:
+                pass
+    
+    return re.compile(pattern, flags)
+
+
+# Quick test
+if __name__ == "__main__":
+    print("Regex Engine Module")
+    print("=" * 50)
+    print(f"RE2 available: {RE2_AVAILABLE}")
+    
+    for sample in (r"(?:Rs\.?|INR|₹)\s*([\d,]+)", r"\b\d{1,2}/\d{1,2}/\d{4}\b", r"[^\n]+(?=\n)",
+                   r"terminate(.+?)(?:\.|;|$)", r"[$]\s*\d+"):
+        print(f"{sample!r} -> {_to_re2_syntax(sample)!r}")
+    
+    # A bare $ stays on re unless MULTILINE is set
+    print(f"$ with MULTILINE -> {_to_re2_syntax(r'notice$', re.MULTILINE)!r}")
+    
+    pattern = compile_pattern(r"penalty\s+of\s+(?:rs\.?|inr|₹)\s*[\d,]+", re.IGNORECASE)
+    print(f"Match: {pattern.search('A PENALTY OF Rs. 5,00,000 applies').group()}")
@@ -3,11 +3,25 @@ Risk Assessor Module
 Comprehensive risk scoring and analysis for contract clauses
 """
 
-import re
+import os
+import sys
+import multiprocessing
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from operator import attrgetter
 from typing import List, Dict, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from .keyword_matcher import KeywordMatcher
+from .regex_engine import compile_pattern
+
+# Sort key for findings, highest score first
+_finding_score = attrgetter("score")
+
+# __slots__ for result objects; dataclass(slots=...) needs Python 3.10+
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class RiskLevel(Enum):
     LOW = "LOW"
@@ -16,7 +30,24 @@ class RiskLevel(Enum):
     CRITICAL = "CRITICAL"
 
 
-@dataclass
+def _level_for_score(score: float) -> RiskLevel:
+    """Risk level band of a numeric score"""
+    if score >= 8:
+        return RiskLevel.CRITICAL
+    elif score >= 6:
+        return RiskLevel.HIGH
+    elif score >= 4:
+        return RiskLevel.MEDIUM
+    else:
+        return RiskLevel.LOW
+
+
+# Levels of the whole-number scores every finding uses, looked up instead of
+# walking the bands (RiskLevel member access is comparatively slow)
+_LEVEL_BY_SCORE = {score: _level_for_score(score) for score in range(11)}
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class RiskFinding:
     """Represents a single risk finding in the contract"""
     clause_id: str
@@ -29,7 +60,7 @@ class RiskFinding:
     indian_law_reference: str = ""
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class RiskReport:
     """Complete risk assessment report for a contract"""
     overall_score: float
@@ -65,7 +96,10 @@ class RiskAssessor:
         "missing_confidentiality": 3
     }
     
-    # Risk detection patterns
+    # Risk detection patterns. Gaps between key phrases are capped at 200
+    # characters (.{0,200}, not .*): an unbounded gap before another phrase
+    # backtracks polynomially on long lines, so one crafted paragraph could
+    # stall the re fallback.
     RISK_PATTERNS = {
         "unlimited_liability": {
             "patterns": [
@@ -82,7 +116,7 @@ class RiskAssessor:
             "patterns": [
                 r"(?:vendor|contractor|employee|consultant)\s+shall\s+(?:fully\s+)?indemnify",
                 r"indemnify\s+(?:and\s+hold\s+harmless\s+)?(?:the\s+)?(?:company|employer|client)",
-                r"defend\s+(?:and\s+)?indemnify.*(?:all|any)\s+claims"
+                r"defend\s+(?:and\s+)?indemnify.{0,200}(?:all|any)\s+claims"
             ],
             "description": "One-sided indemnification favoring the other party",
             "suggestion": "Request mutual indemnification or limit indemnity scope",
@@ -100,10 +134,10 @@ class RiskAssessor:
         },
         "ip_full_transfer": {
             "patterns": [
-                r"assign(?:s|ed)?\s+all\s+(?:right|title|interest).*(?:intellectual\s+property|ip|work\s+product)",
+                r"assign(?:s|ed)?\s+all\s+(?:right|title|interest).{0,200}(?:intellectual\s+property|ip|work\s+product)",
                 r"work(?:s)?\s+(?:made\s+)?for\s+hire",
-                r"(?:all|any)\s+(?:inventions?|creations?|developments?).*(?:belong|vest|transfer).*(?:company|employer)",
-                r"irrevocable.*(?:license|assignment|transfer).*(?:ip|intellectual)"
+                r"(?:all|any)\s+(?:inventions?|creations?|developments?).{0,200}(?:belong|vest|transfer).{0,200}(?:company|employer)",
+                r"irrevocable.{0,200}(?:license|assignment|transfer).{0,200}(?:ip|intellectual)"
             ],
             "description": "Complete transfer of intellectual property rights",
             "suggestion": "Negotiate to retain rights to pre-existing IP and general knowledge",
@@ -111,9 +145,9 @@ class RiskAssessor:
         },
         "broad_non_compete": {
             "patterns": [
-                r"(?:shall\s+)?not\s+(?:directly\s+or\s+indirectly\s+)?(?:engage|work|compete).*(?:worldwide|global|any\s+(?:market|territory))",
-                r"non-compete.*(?:[2-9]|[1-9]\d+)\s+years",
-                r"restrain(?:ed|t)?\s+from\s+(?:engaging|working|competing).*(?:perpetual|indefinite)"
+                r"(?:shall\s+)?not\s+(?:directly\s+or\s+indirectly\s+)?(?:engage|work|compete).{0,200}(?:worldwide|global|any\s+(?:market|territory))",
+                r"non-compete.{0,200}(?:[2-9]|[1-9]\d+)\s+years",
+                r"restrain(?:ed|t)?\s+from\s+(?:engaging|working|competing).{0,200}(?:perpetual|indefinite)"
             ],
             "description": "Overly broad non-compete restrictions",
             "suggestion": "Limit geographic scope and duration (6-12 months is typical in India)",
@@ -122,8 +156,8 @@ class RiskAssessor:
         "excessive_penalty": {
             "patterns": [
                 r"(?:penalty|liquidated\s+damages)\s+(?:of|equal\s+to)\s+(?:rs\.?|inr|₹)\s*(?:[5-9]\d{5,}|[1-9]\d{6,})",
-                r"forfeit.*(?:entire|full|all).*(?:amount|fee|payment)",
-                r"penalty.*(?:double|triple|twice|thrice)"
+                r"forfeit.{0,200}(?:entire|full|all).{0,200}(?:amount|fee|payment)",
+                r"penalty.{0,200}(?:double|triple|twice|thrice)"
             ],
             "description": "Potentially excessive penalty clauses",
             "suggestion": "Negotiate reasonable and proportionate penalties",
@@ -132,7 +166,7 @@ class RiskAssessor:
         "auto_renewal_hidden": {
             "patterns": [
                 r"(?:automatically|auto)\s+renew(?:ed|s)?",
-                r"shall\s+(?:continue|renew)\s+(?:for|unless).*(?:notice|terminated)",
+                r"shall\s+(?:continue|renew)\s+(?:for|unless).{0,200}(?:notice|terminated)",
                 r"evergreen\s+(?:clause|term|provision)"
             ],
             "description": "Automatic renewal clause that may lock you in",
@@ -142,7 +176,7 @@ class RiskAssessor:
         "unfavorable_jurisdiction": {
             "patterns": [
                 r"(?:exclusive\s+)?jurisdiction\s+(?:of|in)\s+(?:courts?\s+(?:of|in)\s+)?(?:london|new\s+york|singapore|hong\s+kong|us|uk|england)",
-                r"governed\s+by.*(?:laws?\s+of\s+)?(?:england|new\s+york|singapore|delaware)"
+                r"governed\s+by.{0,200}(?:laws?\s+of\s+)?(?:england|new\s+york|singapore|delaware)"
             ],
             "description": "Foreign jurisdiction may be costly and inconvenient",
             "suggestion": "Negotiate for local Indian jurisdiction (preferably your state)",
@@ -150,8 +184,8 @@ class RiskAssessor:
         },
         "vague_termination": {
             "patterns": [
-                r"terminate.*(?:any\s+reason|no\s+reason|whatsoever)",
-                r"(?:at\s+will|without\s+cause).*terminat"
+                r"terminate.{0,200}(?:any\s+reason|no\s+reason|whatsoever)",
+                r"(?:at\s+will|without\s+cause).{0,200}terminat"
             ],
             "description": "Vague termination grounds without proper process",
             "suggestion": "Define specific grounds for termination and cure periods",
@@ -167,6 +201,71 @@ class RiskAssessor:
         }
     }
     
+    # RISK_PATTERNS compiled once when the class is created (RE2 when installed,
+    # so crafted contract text cannot make the .* patterns backtrack). The
+    # patterns are lower-case and only ever run on lower-cased text, so they
+    # are compiled without IGNORECASE and the engine skips case folding.
+    _RISK_REGEXES = {
+        risk_type: [compile_pattern(pattern) for pattern in risk_info["patterns"]]
+        for risk_type, risk_info in RISK_PATTERNS.items()
+    }
+    
+    # One alternation per risk type; a single search rules out every pattern
+    # of a type that does not occur, and otherwise finds where to start
+    _RISK_REGEX_UNIONS = {
+        risk_type: compile_pattern("|".join(f"(?:{pattern})" for pattern in risk_info["patterns"]))
+        for risk_type, risk_info in RISK_PATTERNS.items()
+    }
+    
+    # Protective clauses whose absence is reported, with keywords that show presence
+    MISSING_PROTECTION_CHECKS = {
+        "liability_cap": {
+            "check": ["limitation of liability", "liability cap", "liability shall not exceed", "maximum liability"],
+            "description": "Missing liability limitation clause",
+            "suggestion": "Add a clause capping total liability exposure",
+            "score": 5
+        },
+        "dispute_resolution": {
+            "check": ["arbitration", "dispute resolution", "mediation", "conciliation"],
+            "description": "Missing dispute resolution mechanism",
+            "suggestion": "Include arbitration clause as per Arbitration and Conciliation Act, 1996",
+            "score": 4
+        },
+        "notice_period": {
+            "check": ["notice period", "days notice", "written notice", "prior notice"],
+            "description": "Missing or unclear notice period requirements",
+            "suggestion": "Specify clear notice periods for termination and other actions",
+            "score": 4
+        },
+        "force_majeure": {
+            "check": ["force majeure", "act of god", "unforeseen circumstances"],
+            "description": "Missing force majeure clause",
+            "suggestion": "Add force majeure clause to protect against unforeseen events",
+            "score": 3
+        },
+        "confidentiality": {
+            "check": ["confidential", "non-disclosure", "proprietary information", "trade secret"],
+            "description": "Missing confidentiality provisions",
+            "suggestion": "Include mutual confidentiality obligations",
+            "score": 3
+        }
+    }
+    
+    # Every MISSING_PROTECTION_CHECKS keyword, found in one pass per document
+    _PROTECTION_MATCHER = KeywordMatcher(
+        keyword
+        for check_info in MISSING_PROTECTION_CHECKS.values()
+        for keyword in check_info["check"]
+    )
+    
+    # Display labels ("unlimited_liability" -> "Unlimited Liability"), built
+    # once so every finding of a type shares one string object
+    _RISK_LABELS = {risk_type: risk_type.replace("_", " ").title() for risk_type in RISK_WEIGHTS}
+    _MISSING_LABELS = {
+        check_type: f"Missing {check_type.replace('_', ' ').title()}"
+        for check_type in MISSING_PROTECTION_CHECKS
+    }
+    
     # Indian law compliance checks
     INDIAN_LAW_COMPLIANCE = {
         "stamp_duty": "Contract may require stamp duty as per Indian Stamp Act",
@@ -177,79 +276,151 @@ class RiskAssessor:
         "it_act_compliance": "Electronic contracts must comply with IT Act 2000"
     }
     
+    # Batches are spread over at most this many worker processes
+    MAX_BATCH_WORKERS = 8
+    
     def __init__(self):
         self.findings: List[RiskFinding] = []
         self.overall_score = 0.0
     
-    def assess_contract(self, text: str, clauses: List[Dict] = None) -> RiskReport:
+    def assess_contract(self, text: str, clauses: List[Dict] = None,
+                        text_lower: str = None) -> RiskReport:
         """
         Perform comprehensive risk assessment on the contract
         
         Args:
             text: Full contract text
             clauses: Optional list of pre-extracted clauses
+            text_lower: Pre-computed text.lower(), if the caller already has it
             
         Returns:
             RiskReport with all findings
         """
-        self.findings = []
+        # Built locally and published at the end, so a shared (cached)
+        # assessor never mixes findings from concurrent calls
+        findings: List[RiskFinding] = []
+        
+        # Lower-case the document once for all case-insensitive scans
+        if text_lower is None:
+            text_lower = text.lower()
         
         # Analyze full text for risk patterns
-        self._analyze_text_risks(text)
+        self._analyze_text_risks(text, text_lower, findings)
         
         # Analyze individual clauses if provided
         if clauses:
+            seen = {(f.clause_id, f.risk_type) for f in findings}
             for clause in clauses:
-                self._analyze_clause_risks(clause)
+                self._analyze_clause_risks(clause, seen, findings)
         
         # Check for missing important clauses
-        self._check_missing_protections(text)
+        self._check_missing_protections(text_lower, findings)
         
         # Calculate overall score
-        report = self._calculate_overall_score()
+        report = self._calculate_overall_score(findings)
         
+        self.findings = findings
         return report
     
-    def _analyze_text_risks(self, text: str):
-        """Analyze full text for risk patterns"""
-        text_lower = text.lower()
+    def assess_batch(self, texts: List[str], max_workers: int = None) -> List[RiskReport]:
+        """
+        Assess many contracts, spread across worker processes
+        
+        The patterns and keyword matchers are class attributes built at
+        import, so each worker compiles them once and every document in
+        its share reuses them.
+        
+        Args:
+            texts: Full text of each contract
+            max_workers: Upper bound on worker processes (default MAX_BATCH_WORKERS)
+            
+        Returns:
+            One RiskReport per text, in input order
+        """
+        workers = min(os.cpu_count() or 1, max_workers or self.MAX_BATCH_WORKERS, len(texts))
+        if workers < 2:
+            return [_assess_text(text) for text in texts]
+        
+        try:
+            chunksize = -(-len(texts) // (workers * 4))  # ceil division
+            # Never fork the (multi-threaded) Streamlit host: a fork taken while
+            # another thread holds a lock can deadlock the worker
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                return list(pool.map(_assess_text, texts, chunksize=chunksize))
+        except Exception as e:
+            print(f"Parallel risk assessment failed: {e}, assessing serially...")
+            return [_assess_text(text) for text in texts]
+    
+    def _analyze_text_risks(self, text: str, text_lower: str, findings: List[RiskFinding]):
+        """Analyze full text (and its lower-cased copy) for risk patterns, appending to findings"""
+        # (risk type, text) of findings so far, for constant-time duplicate checks
+        seen = {(f.risk_type, f.original_text) for f in findings}
         
         for risk_type, risk_info in self.RISK_PATTERNS.items():
-            for pattern in risk_info["patterns"]:
-                matches = list(re.finditer(pattern, text_lower, re.IGNORECASE))
-                for match in matches:
+            # No pattern of this type can match before the union's first hit
+            first_hit = self._RISK_REGEX_UNIONS[risk_type].search(text_lower)
+            if first_hit is None:
+                continue
+            
+            # Score, level and label only depend on the risk type
+            score = self.RISK_WEIGHTS.get(risk_type, 5)
+            level = self._score_to_level(score)
+            risk_label = self._RISK_LABELS[risk_type]
+            
+            # Context windows already reported for this risk type
+            seen_windows = set()
+            
+            for pattern in self._RISK_REGEXES[risk_type]:
+                for match in pattern.finditer(text_lower, first_hit.start()):
                     # Get surrounding context (100 chars before and after)
                     start = max(0, match.start() - 100)
                     end = min(len(text), match.end() + 100)
-                    context = text[start:end]
                     
-                    # Create finding
-                    score = self.RISK_WEIGHTS.get(risk_type, 5)
-                    level = self._score_to_level(score)
+                    # Patterns of one type often hit the same span; the same
+                    # window gives the same context, so skip it before slicing
+                    if (start, end) in seen_windows:
+                        continue
+                    seen_windows.add((start, end))
+                    
+                    # Avoid duplicate findings for same risk type
+                    context = text[start:end].strip()
+                    key = (risk_label, context)
+                    if key in seen:
+                        continue
+                    seen.add(key)
                     
-                    finding = RiskFinding(
+                    findings.append(RiskFinding(
                         clause_id="general",
-                        risk_type=risk_type.replace("_", " ").title(),
+                        risk_type=risk_label,
                         risk_level=level,
                         score=score,
                         description=risk_info["description"],
-                        original_text=context.strip(),
+                        original_text=context,
                         suggestion=risk_info["suggestion"],
                         indian_law_reference=risk_info.get("indian_law", "")
-                    )
-                    
-                    # Avoid duplicate findings for same risk type
-                    if not any(f.risk_type == finding.risk_type and f.original_text == finding.original_text 
-                               for f in self.findings):
-                        self.findings.append(finding)
+                    ))
     
-    def _analyze_clause_risks(self, clause: Dict):
-        """Analyze a specific clause for risks"""
+    def _analyze_clause_risks(self, clause: Dict, seen: set, findings: List[RiskFinding]):
+        """
+        Analyze a specific clause for risks
+        
+        Args:
+            clause: Clause dictionary (content, clause_id, risk_indicators)
+            seen: (clause_id, risk_type) pairs already reported, shared
+                  across the clauses of one assessment
+            findings: Findings of the current assessment, appended to
+        """
+        
         content = clause.get("content", "")
         clause_id = clause.get("clause_id", clause.get("number", "unknown"))
         
-        # Check for risk indicators already extracted
-        risk_indicators = clause.get("risk_indicators", [])
+        # Use risk indicators already extracted; clauses that never went
+        # through extraction are scanned against RISK_PATTERNS instead
+        risk_indicators = clause.get("risk_indicators")
+        if risk_indicators is None:
+            risk_indicators = self._scan_risk_types(content.lower())
         
         for indicator in risk_indicators:
             if indicator in self.RISK_WEIGHTS:
@@ -258,7 +429,7 @@ class RiskAssessor:
                 
                 finding = RiskFinding(
                     clause_id=str(clause_id),
-                    risk_type=indicator.replace("_", " ").title(),
+                    risk_type=self._RISK_LABELS[indicator],
                     risk_level=self._score_to_level(score),
                     score=score,
                     description=risk_info.get("description", indicator),
@@ -267,54 +438,20 @@ class RiskAssessor:
                     indian_law_reference=risk_info.get("indian_law", "")
                 )
                 
-                if not any(f.clause_id == finding.clause_id and f.risk_type == finding.risk_type 
-                           for f in self.findings):
-                    self.findings.append(finding)
+                key = (finding.clause_id, finding.risk_type)
+                if key not in seen:
+                    seen.add(key)
+                    findings.append(finding)
     
-    def _check_missing_protections(self, text: str):
-        """Check for missing important protective clauses"""
-        text_lower = text.lower()
+    def _check_missing_protections(self, text_lower: str, findings: List[RiskFinding]):
+        """Check the lower-cased text for missing important protective clauses, appending to findings"""
+        found_keywords = self._PROTECTION_MATCHER.find(text_lower)
         
-        missing_checks = {
-            "liability_cap": {
-                "check": ["limitation of liability", "liability cap", "liability shall not exceed", "maximum liability"],
-                "description": "Missing liability limitation clause",
-                "suggestion": "Add a clause capping total liability exposure",
-                "score": 5
-            },
-            "dispute_resolution": {
-                "check": ["arbitration", "dispute resolution", "mediation", "conciliation"],
-                "description": "Missing dispute resolution mechanism",
-                "suggestion": "Include arbitration clause as per Arbitration and Conciliation Act, 1996",
-                "score": 4
-            },
-            "notice_period": {
-                "check": ["notice period", "days notice", "written notice", "prior notice"],
-                "description": "Missing or unclear notice period requirements",
-                "suggestion": "Specify clear notice periods for termination and other actions",
-                "score": 4
-            },
-            "force_majeure": {
-                "check": ["force majeure", "act of god", "unforeseen circumstances"],
-                "description": "Missing force majeure clause",
-                "suggestion": "Add force majeure clause to protect against unforeseen events",
-                "score": 3
-            },
-            "confidentiality": {
-                "check": ["confidential", "non-disclosure", "proprietary information", "trade secret"],
-                "description": "Missing confidentiality provisions",
-                "suggestion": "Include mutual confidentiality obligations",
-                "score": 3
-            }
-        }
-        
-        for check_type, check_info in missing_checks.items():
-            found = any(keyword in text_lower for keyword in check_info["check"])
-            
-            if not found:
+        for check_type, check_info in self.MISSING_PROTECTION_CHECKS.items():
+            if found_keywords.isdisjoint(check_info["check"]):
                 finding = RiskFinding(
                     clause_id="missing",
-                    risk_type=f"Missing {check_type.replace('_', ' ').title()}",
+                    risk_type=self._MISSING_LABELS[check_type],
                     risk_level=self._score_to_level(check_info["score"]),
                     score=check_info["score"],
                     description=check_info["description"],
@@ -322,22 +459,16 @@ class RiskAssessor:
                     suggestion=check_info["suggestion"],
                     indian_law_reference=""
                 )
-                self.findings.append(finding)
+                findings.append(finding)
     
     def _score_to_level(self, score: float) -> RiskLevel:
         """Convert numeric score to risk level"""
-        if score >= 8:
-            return RiskLevel.CRITICAL
-        elif score >= 6:
-            return RiskLevel.HIGH
-        elif score >= 4:
-            return RiskLevel.MEDIUM
-        else:
-            return RiskLevel.LOW
+        level = _LEVEL_BY_SCORE.get(score)
+        return level if level is not None else _level_for_score(score)
     
-    def _calculate_overall_score(self) -> RiskReport:
-        """Calculate overall risk score and generate report"""
-        if not self.findings:
+    def _calculate_overall_score(self, findings: List[RiskFinding]) -> RiskReport:
+        """Calculate overall risk score and generate report from findings"""
+        if not findings:
             return RiskReport(
                 overall_score=2.0,
                 overall_level=RiskLevel.LOW,
@@ -348,15 +479,20 @@ class RiskAssessor:
                 summary="No significant risks found. Contract appears well-balanced."
             )
         
-        # Count by level
-        critical_count = sum(1 for f in self.findings if f.risk_level == RiskLevel.CRITICAL)
-        high_count = sum(1 for f in self.findings if f.risk_level == RiskLevel.HIGH)
-        medium_count = sum(1 for f in self.findings if f.risk_level == RiskLevel.MEDIUM)
-        low_count = sum(1 for f in self.findings if f.risk_level == RiskLevel.LOW)
+        # Count by level and total the scores in a single pass
+        level_counts = Counter()
+        total_score = 0.0
+        for f in findings:
+            level_counts[f.risk_level] += 1
+            total_score += f.score
+        
+        critical_count = level_counts[RiskLevel.CRITICAL]
+        high_count = level_counts[RiskLevel.HIGH]
+        medium_count = level_counts[RiskLevel.MEDIUM]
+        low_count = level_counts[RiskLevel.LOW]
         
         # Calculate weighted average score
-        total_score = sum(f.score for f in self.findings)
-        avg_score = total_score / len(self.findings)
+        avg_score = total_score / len(findings)
         
         # Adjust for severity
         if critical_count > 0:
@@ -383,10 +519,18 @@ class RiskAssessor:
             high_risk_count=critical_count + high_count,
             medium_risk_count=medium_count,
             low_risk_count=low_count,
-            findings=sorted(self.findings, key=lambda x: x.score, reverse=True),
+            findings=sorted(findings, key=_finding_score, reverse=True),
             summary=summary
         )
     
+    def _scan_risk_types(self, text_lower: str) -> List[str]:
+        """Risk types with at least one pattern matching the lower-cased text"""
+        # A union matches exactly when one of its patterns does
+        return [
+            risk_type for risk_type, union in self._RISK_REGEX_UNIONS.items()
+            if union.search(text_lower)
+        ]
+    
     def get_clause_risk_score(self, clause_content: str) -> Tuple[float, RiskLevel, List[str]]:
         """
         Quick risk assessment for a single clause
@@ -394,14 +538,7 @@ class RiskAssessor:
         Returns:
             Tuple of (score, level, risk_types found)
         """
-        findings = []
-        content_lower = clause_content.lower()
-        
-        for risk_type, risk_info in self.RISK_PATTERNS.items():
-            for pattern in risk_info["patterns"]:
-                if re.search(pattern, content_lower, re.IGNORECASE):
-                    findings.append(risk_type)
-                    break
+        findings = self._scan_risk_types(clause_content.lower())
         
         if not findings:
             return (2.0, RiskLevel.LOW, [])
@@ -410,6 +547,11 @@ class RiskAssessor:
         return (max_score, self._score_to_level(max_score), findings)
 
 
+def _assess_text(text: str) -> RiskReport:
+    """Assess one contract with a fresh assessor (runs in a worker process)"""
+    return RiskAssessor().assess_contract(text)
+
+
 # Quick test
 if __name__ == "__main__":
     assessor = RiskAssessor()
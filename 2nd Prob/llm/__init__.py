@@ -4,5 +4,6 @@ LLM module for Contract Analysis & Risk Assessment Bot
 
 from .legal_analyzer import LegalAnalyzer
 from .prompts import PromptTemplates
+from .response_cache import ResponseCache
 
-__all__ = ["LegalAnalyzer", "PromptTemplates"]
+__all__ = ["LegalAnalyzer", "PromptTemplates", "ResponseCache"]
@@ -4,19 +4,47 @@ LLM integration for intelligent contract analysis using OpenAI GPT-4
 """
 
 import os
+import re
 import json
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import asyncio
+from functools import cached_property, lru_cache
+from typing import Callable, Dict, List, Optional, Any
+from dataclasses import dataclass, asdict, replace
 
 # Try to import OpenAI
 try:
-    from openai import OpenAI
+    import httpx
+    from openai import OpenAI, AsyncOpenAI
     OPENAI_AVAILABLE = True
 except ImportError:
     OPENAI_AVAILABLE = False
     OpenAI = None
+    AsyncOpenAI = None
 
 from .prompts import PromptTemplates
+from .response_cache import ResponseCache
+
+# "### ITEM 3" headings separating the answers to a batched clause prompt
+_ITEM_HEADING_RE = re.compile(r'^[ \t]*#{1,6}[ \t]*ITEM[ \t]+(\d+)\b.*$', re.MULTILINE | re.IGNORECASE)
+
+
+class _RequestPacer:
+    """Spaces API request starts evenly to stay under a requests-per-minute limit"""
+    
+    def __init__(self, requests_per_minute: int):
+        self.interval = 60.0 / requests_per_minute
+        self._next_start = 0.0
+        self._lock = asyncio.Lock()
+    
+    async def wait(self):
+        """Sleep until this request's slot comes up"""
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        
+        if start > now:
+            await asyncio.sleep(start - now)
 
 
 @dataclass
@@ -25,6 +53,7 @@ class AnalysisResult:
     success: bool
     content: str
     tokens_used: int = 0
+    cached_tokens: int = 0
     model: str = ""
     error: str = ""
 
@@ -34,34 +63,103 @@ class LegalAnalyzer:
     LLM-powered legal analysis using OpenAI GPT-4
     """
     
-    def __init__(self, api_key: str = None, model: str = "gpt-4-turbo-preview"):
+    # Chunk size for long-contract summaries; stays under the 15k-char
+    # slice applied by PromptTemplates.get_summary_prompt
+    SUMMARY_CHUNK_CHARS = 12000
+    
+    # Concurrent requests per batch (keeps bursts within API rate limits) and
+    # client-side retries, with exponential backoff, on rate-limit/5xx errors
+    MAX_CONCURRENT_REQUESTS = 8
+    MAX_RETRIES = 3
+    
+    # Seconds allowed per request, and for opening a connection
+    REQUEST_TIMEOUT = 120.0
+    CONNECT_TIMEOUT = 5.0
+    
+    # Clauses packed into one request by explain_clauses_grouped, and the
+    # response tokens allowed per clause
+    CLAUSES_PER_PROMPT = 6
+    BATCH_TOKENS_PER_CLAUSE = 400
+    
+    # Responses shared by all analyzer instances in the process, so repeated
+    # and boilerplate clauses skip the API call. Set LLM_CACHE_PATH to a
+    # SQLite file to keep them across restarts as well
+    _response_cache = ResponseCache(max_entries=256, ttl=3600, path=os.getenv("LLM_CACHE_PATH"))
+    
+    # Topic keywords for get_quick_assessment
+    QUICK_TOPICS = {
+        "payment": ["payment", "fee", "salary", "compensation", "amount"],
+        "termination": ["termination", "terminate", "cancel"],
+        "confidentiality": ["confidential", "nda", "non-disclosure"],
+        "liability": ["liability", "indemnify", "damages"],
+        "ip": ["intellectual property", "copyright", "patent"],
+        "non-compete": ["non-compete", "compete", "competitive"]
+    }
+    
+    def __init__(self, api_key: str = None, model: str = "gpt-4-turbo-preview",
+                 requests_per_minute: int = None):
         """
         Initialize the Legal Analyzer
         
         Args:
             api_key: OpenAI API key (or set OPENAI_API_KEY env var)
             model: Model to use (gpt-4-turbo-preview, gpt-4, gpt-3.5-turbo)
+            requests_per_minute: Optional cap on API requests started per
+                                 minute by concurrent batches (None = no cap)
         """
         self.api_key = api_key or os.getenv("OPENAI_API_KEY", "")
         self.model = model
-        self.client = None
+        self.requests_per_minute = requests_per_minute
+        self.system_prompt = PromptTemplates.SYSTEM_PROMPT
+    
+    @cached_property
+    def client(self):
+        """
+        OpenAI client, created on first use
         
+        Building it sets up an HTTP connection pool, which analyzers that
+        only serve fallback or quick assessments never need.
+        """
         if OPENAI_AVAILABLE and self.api_key:
-            self.client = OpenAI(api_key=self.api_key)
+            return self._shared_client(self.api_key)
+        return None
+    
+    @classmethod
+    @lru_cache(maxsize=4)
+    def _shared_client(cls, api_key: str):
+        """
+        OpenAI client shared by every analyzer using the same API key
         
-        self.system_prompt = PromptTemplates.SYSTEM_PROMPT
+        The app builds a new analyzer on each rerun; sharing the client lets
+        their requests reuse its keep-alive connections instead of paying a
+        TCP and TLS handshake each time.
+        """
+        return OpenAI(
+            api_key=api_key,
+            max_retries=cls.MAX_RETRIES,
+            timeout=cls._timeout()
+        )
+    
+    @classmethod
+    def _timeout(cls) -> "httpx.Timeout":
+        """Request timeout with a short connect phase to bound stragglers"""
+        return httpx.Timeout(cls.REQUEST_TIMEOUT, connect=cls.CONNECT_TIMEOUT)
     
     def is_available(self) -> bool:
         """Check if LLM is available and configured"""
-        return OPENAI_AVAILABLE and self.client is not None and bool(self.api_key)
+        return OPENAI_AVAILABLE and bool(self.api_key)
     
-    def _call_llm(self, prompt: str, max_tokens: int = 2000) -> AnalysisResult:
+    def _call_llm(self, prompt: str, max_tokens: int = 2000, context: str = None,
+                  on_delta: Callable[[str], None] = None) -> AnalysisResult:
         """
         Make a call to the LLM
         
         Args:
             prompt: The user prompt
             max_tokens: Maximum tokens in response
+            context: Optional contract-text message sent before the prompt
+            on_delta: If given, the response is streamed and each text piece
+                      is passed to it as it arrives (not called on cache hits)
             
         Returns:
             AnalysisResult with response or error
@@ -73,26 +171,84 @@ class LegalAnalyzer:
                 error="LLM not available. Please configure OPENAI_API_KEY."
             )
         
+        key = self._cache_key(prompt, max_tokens, context)
+        cached = self._from_cache(key)
+        if cached is not None:
+            return cached
+        
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=0.3  # Lower temperature for more consistent legal analysis
-            )
+            request = self._build_request(prompt, max_tokens, context)
+            if on_delta is not None:
+                return self._store(key, self._stream_result(request, on_delta))
             
-            content = response.choices[0].message.content
-            tokens = response.usage.total_tokens if response.usage else 0
+            response = self.client.chat.completions.create(**request)
+            return self._store(key, self._to_result(response))
             
+        except Exception as e:
             return AnalysisResult(
-                success=True,
-                content=content,
-                tokens_used=tokens,
-                model=self.model
+                success=False,
+                content="",
+                error=str(e)
+            )
+    
+    def _stream_result(self, request: Dict[str, Any], on_delta: Callable[[str], None]) -> AnalysisResult:
+        """
+        Run a streamed chat completion, passing each text piece to on_delta
+        
+        Returns:
+            AnalysisResult with the full response text (tokens_used is only
+            filled in when the API reports usage on the stream)
+        """
+        parts = []
+        tokens = 0
+        
+        for chunk in self.client.chat.completions.create(stream=True, **request):
+            usage = getattr(chunk, "usage", None)
+            if usage:
+                tokens = usage.total_tokens
+            
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                on_delta(delta)
+        
+        return AnalysisResult(
+            success=True,
+            content="".join(parts),
+            tokens_used=tokens,
+            model=self.model
+        )
+    
+    async def _call_llm_async(self, client, prompt: str, max_tokens: int = 2000,
+                              pacer: _RequestPacer = None) -> AnalysisResult:
+        """
+        Async variant of _call_llm using an AsyncOpenAI client
+        
+        Args:
+            client: AsyncOpenAI client bound to the running event loop
+            prompt: The user prompt
+            max_tokens: Maximum tokens in response
+            pacer: Optional rate limiter, waited on before an API request
+                   (cache hits go straight through)
+            
+        Returns:
+            AnalysisResult with response or error
+        """
+        key = self._cache_key(prompt, max_tokens)
+        cached = self._from_cache(key)
+        if cached is not None:
+            return cached
+        
+        if pacer is not None:
+            await pacer.wait()
+        
+        try:
+            response = await client.chat.completions.create(
+                **self._build_request(prompt, max_tokens)
             )
+            return self._store(key, self._to_result(response))
             
         except Exception as e:
             return AnalysisResult(
@@ -101,32 +257,175 @@ class LegalAnalyzer:
                 error=str(e)
             )
     
-    def summarize_contract(self, contract_text: str) -> AnalysisResult:
+    def _cache_key(self, prompt: str, max_tokens: int, context: str = None) -> str:
+        """Build the response-cache key for a request"""
+        return ResponseCache.make_key(self.model, max_tokens, context, prompt)
+    
+    def _from_cache(self, key: str) -> Optional[AnalysisResult]:
+        """Return a copy of a cached result (no tokens spent), or None"""
+        cached = self._response_cache.get(key)
+        if cached is None:
+            return None
+        return replace(AnalysisResult(**cached), tokens_used=0, cached_tokens=0)
+    
+    def _store(self, key: str, result: AnalysisResult) -> AnalysisResult:
+        """Cache a successful result and return it"""
+        if result.success:
+            self._response_cache.put(key, asdict(result))
+        return result
+    
+    def _build_request(self, prompt: str, max_tokens: int, context: str = None) -> Dict[str, Any]:
+        """Build chat completion arguments for a prompt"""
+        messages = [{"role": "system", "content": self.system_prompt}]
+        
+        if context:
+            # System prompt + contract text stay identical across tasks on the
+            # same contract, so OpenAI's automatic prompt caching reuses them
+            messages.append({"role": "user", "content": context})
+        
+        messages.append({"role": "user", "content": prompt})
+        
+        return {
+            "model": self.model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": 0.3  # Lower temperature for more consistent legal analysis
+        }
+    
+    def _to_result(self, response) -> AnalysisResult:
+        """Convert a chat completion response into an AnalysisResult"""
+        content = response.choices[0].message.content
+        tokens = response.usage.total_tokens if response.usage else 0
+        
+        # Prompt tokens served from OpenAI's prompt cache (newer API versions)
+        details = getattr(response.usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", 0) or 0
+        
+        return AnalysisResult(
+            success=True,
+            content=content,
+            tokens_used=tokens,
+            cached_tokens=cached,
+            model=self.model
+        )
+    
+    def summarize_contract(self, contract_text: str,
+                           on_delta: Callable[[str], None] = None) -> AnalysisResult:
         """
         Generate a comprehensive contract summary
         
         Args:
             contract_text: Full contract text
+            on_delta: Optional callback receiving the summary as it streams in
             
         Returns:
             AnalysisResult with summary
         """
-        prompt = PromptTemplates.get_summary_prompt(contract_text)
-        return self._call_llm(prompt, max_tokens=1500)
+        context = PromptTemplates.get_contract_context(contract_text)
+        prompt = PromptTemplates.get_summary_prompt(contract_text, include_text=False)
+        return self._call_llm(prompt, max_tokens=1500, context=context, on_delta=on_delta)
     
-    def explain_clause(self, clause_text: str, clause_type: str = "General") -> AnalysisResult:
+    def summarize_contract_chunked(self, contract_text: str) -> AnalysisResult:
+        """
+        Summarize a contract of any length
+        
+        Long contracts are split into paragraph-aligned chunks that are
+        summarized concurrently, then merged in one final call, so no part
+        of the text is dropped.
+        
+        Args:
+            contract_text: Full contract text
+            
+        Returns:
+            AnalysisResult with summary (tokens_used covers all calls)
+        """
+        chunks = self._split_into_chunks(contract_text, self.SUMMARY_CHUNK_CHARS)
+        
+        if len(chunks) <= 1:
+            return self.summarize_contract(contract_text)
+        
+        if not self.is_available():
+            return AnalysisResult(
+                success=False,
+                content="",
+                error="LLM not available. Please configure OPENAI_API_KEY."
+            )
+        
+        prompts = [PromptTemplates.get_summary_prompt(chunk) for chunk in chunks]
+        partials = asyncio.run(self._call_llm_batch(prompts, max_tokens=1000))
+        
+        for partial in partials:
+            if not partial.success:
+                return partial
+        
+        prompt = PromptTemplates.get_summary_merge_prompt([p.content for p in partials])
+        result = self._call_llm(prompt, max_tokens=1500)
+        result.tokens_used += sum(p.tokens_used for p in partials)
+        result.cached_tokens += sum(p.cached_tokens for p in partials)
+        return result
+    
+    async def _call_llm_batch(self, prompts: List[str], max_tokens: int) -> List[AnalysisResult]:
+        """
+        Run several prompts concurrently, at most MAX_CONCURRENT_REQUESTS at a time
+        (and at most requests_per_minute request starts per minute, if set)
+        
+        Returns:
+            AnalysisResults in the same order as prompts
+        """
+        semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_REQUESTS)
+        pacer = _RequestPacer(self.requests_per_minute) if self.requests_per_minute else None
+        
+        async def call(client, prompt):
+            async with semaphore:
+                return await self._call_llm_async(client, prompt, max_tokens, pacer)
+        
+        # The async client is bound to this batch's event loop, so it is not shared
+        async with AsyncOpenAI(api_key=self.api_key, max_retries=self.MAX_RETRIES,
+                               timeout=self._timeout()) as client:
+            return await asyncio.gather(*(call(client, prompt) for prompt in prompts))
+    
+    @staticmethod
+    def _split_into_chunks(text: str, max_chars: int) -> List[str]:
+        """
+        Split text into chunks of at most max_chars, breaking at paragraph
+        boundaries where possible
+        """
+        chunks = []
+        current = []
+        current_len = 0
+        
+        for paragraph in text.split("\n\n"):
+            # Hard-split paragraphs that are longer than a whole chunk
+            pieces = [paragraph[i:i + max_chars] for i in range(0, len(paragraph), max_chars)] or [""]
+            
+            for piece in pieces:
+                if current and current_len + len(piece) + 2 > max_chars:
+                    chunks.append("\n\n".join(current))
+                    current = []
+                    current_len = 0
+                current.append(piece)
+                current_len += len(piece) + 2
+        
+        if current:
+            chunks.append("\n\n".join(current))
+        
+        return [chunk for chunk in chunks if chunk.strip()]
+    
+    def explain_clause(self, clause_text: str, clause_type: str = "General",
+                       on_delta: Callable[[str], None] = None) -> AnalysisResult:
         """
         Explain a contract clause in simple language
         
         Args:
             clause_text: The clause text
             clause_type: Type of clause (e.g., "Indemnification", "Termination")
+            on_delta: Optional callback receiving the explanation as it streams in
             
         Returns:
             AnalysisResult with explanation
         """
         prompt = PromptTemplates.get_clause_explanation_prompt(clause_text, clause_type)
-        return self._call_llm(prompt, max_tokens=800)
+        return self._call_llm(prompt, max_tokens=800, on_delta=on_delta)
     
     def analyze_risk(self, clause_text: str, clause_type: str = "General",
                      risk_indicators: List[str] = None) -> AnalysisResult:
@@ -175,22 +474,26 @@ class LegalAnalyzer:
         prompt = PromptTemplates.get_hindi_translation_prompt(hindi_text)
         return self._call_llm(prompt, max_tokens=2000)
     
-    def check_compliance(self, contract_text: str, contract_type: str = "General") -> AnalysisResult:
+    def check_compliance(self, contract_text: str, contract_type: str = "General",
+                         on_delta: Callable[[str], None] = None) -> AnalysisResult:
         """
         Check contract for compliance with Indian laws
         
         Args:
             contract_text: Full contract text
             contract_type: Type of contract
+            on_delta: Optional callback receiving the analysis as it streams in
             
         Returns:
             AnalysisResult with compliance analysis
         """
-        prompt = PromptTemplates.get_compliance_prompt(contract_text, contract_type)
-        return self._call_llm(prompt, max_tokens=1500)
+        context = PromptTemplates.get_contract_context(contract_text)
+        prompt = PromptTemplates.get_compliance_prompt(contract_text, contract_type, include_text=False)
+        return self._call_llm(prompt, max_tokens=1500, context=context, on_delta=on_delta)
     
     def full_analysis(self, contract_text: str, contract_type: str = "Unknown",
-                      parties: List[str] = None, key_terms: List[str] = None) -> AnalysisResult:
+                      parties: List[str] = None, key_terms: List[str] = None,
+                      on_delta: Callable[[str], None] = None) -> AnalysisResult:
         """
         Perform comprehensive contract analysis
         
@@ -199,18 +502,20 @@ class LegalAnalyzer:
             contract_type: Type of contract
             parties: Extracted party names
             key_terms: Extracted key terms
+            on_delta: Optional callback receiving the analysis as it streams in
             
         Returns:
             AnalysisResult with complete analysis
         """
+        context = PromptTemplates.get_contract_context(contract_text, max_chars=20000)
         prompt = PromptTemplates.get_full_analysis_prompt(
-            contract_text, contract_type, parties, key_terms
+            contract_text, contract_type, parties, key_terms, include_text=False
         )
-        return self._call_llm(prompt, max_tokens=3000)
+        return self._call_llm(prompt, max_tokens=3000, context=context, on_delta=on_delta)
     
     def batch_explain_clauses(self, clauses: List[Dict[str, str]]) -> List[AnalysisResult]:
         """
-        Explain multiple clauses (with rate limiting consideration)
+        Explain multiple clauses concurrently (with rate limiting consideration)
         
         Args:
             clauses: List of {"text": "", "type": ""} dicts
@@ -218,15 +523,109 @@ class LegalAnalyzer:
         Returns:
             List of AnalysisResults
         """
-        results = []
-        for clause in clauses[:10]:  # Limit to 10 clauses
-            result = self.explain_clause(
+        prompts = [
+            PromptTemplates.get_clause_explanation_prompt(
                 clause.get("text", ""),
                 clause.get("type", "General")
             )
-            results.append(result)
+            for clause in clauses[:10]  # Limit to 10 clauses
+        ]
+        
+        if not self.is_available():
+            return [self._call_llm(prompt, max_tokens=800) for prompt in prompts]
+        
+        return asyncio.run(self._call_llm_batch(prompts, max_tokens=800))
+    
+    def batch_analyze_risks(self, clauses: List[Dict[str, Any]]) -> List[AnalysisResult]:
+        """
+        Analyze the risks of many clauses concurrently
+        
+        Args:
+            clauses: List of {"text": "", "type": "", "risk_indicators": []} dicts
+            
+        Returns:
+            One AnalysisResult per clause, in the same order
+        """
+        prompts = [
+            PromptTemplates.get_risk_analysis_prompt(
+                clause.get("text", ""),
+                clause.get("type", "General"),
+                clause.get("risk_indicators")
+            )
+            for clause in clauses
+        ]
+        
+        if not self.is_available():
+            return [self._call_llm(prompt, max_tokens=1000) for prompt in prompts]
+        
+        return asyncio.run(self._call_llm_batch(prompts, max_tokens=1000))
+    
+    def explain_clauses_grouped(self, clauses: List[Dict[str, str]]) -> List[AnalysisResult]:
+        """
+        Explain many clauses, several per LLM request
+        
+        Clauses are packed CLAUSES_PER_PROMPT at a time into one prompt, so
+        the system prompt and per-request latency are paid once per group;
+        the groups themselves run concurrently. A group's token usage is
+        reported on its first clause, so totals add up.
+        
+        Args:
+            clauses: List of {"text": "", "type": ""} dicts
+            
+        Returns:
+            One AnalysisResult per clause, in the same order
+        """
+        size = self.CLAUSES_PER_PROMPT
+        groups = [clauses[i:i + size] for i in range(0, len(clauses), size)]
+        prompts = [PromptTemplates.get_batch_clause_explanation_prompt(group) for group in groups]
+        max_tokens = self.BATCH_TOKENS_PER_CLAUSE * size
+        
+        if not prompts:
+            return []
+        if not self.is_available():
+            responses = [self._call_llm(prompt, max_tokens=max_tokens) for prompt in prompts]
+        else:
+            responses = asyncio.run(self._call_llm_batch(prompts, max_tokens=max_tokens))
+        
+        results = []
+        for group, response in zip(groups, responses):
+            if not response.success:
+                results.extend(replace(response) for _ in group)
+                continue
+            
+            sections = self._split_items(response.content, len(group))
+            for index, section in enumerate(sections):
+                results.append(AnalysisResult(
+                    success=section is not None,
+                    content=section or "",
+                    tokens_used=response.tokens_used if index == 0 else 0,
+                    cached_tokens=response.cached_tokens if index == 0 else 0,
+                    model=response.model,
+                    error="" if section is not None else "No explanation returned for this clause"
+                ))
+        
         return results
     
+    @staticmethod
+    def _split_items(content: str, count: int) -> List[Optional[str]]:
+        """
+        Split a batched response on its "### ITEM n" headings
+        
+        Returns:
+            count entries, the text under each item's heading or None if missing
+        """
+        sections: List[Optional[str]] = [None] * count
+        headings = list(_ITEM_HEADING_RE.finditer(content))
+        
+        for heading, following in zip(headings, headings[1:] + [None]):
+            number = int(heading.group(1))
+            end = following.start() if following else len(content)
+            section = content[heading.end():end].strip()
+            if 1 <= number <= count and sections[number - 1] is None and section:
+                sections[number - 1] = section
+        
+        return sections
+    
     def get_quick_assessment(self, contract_text: str) -> Dict[str, Any]:
         """
         Get a quick high-level assessment without detailed LLM analysis
@@ -256,16 +655,7 @@ class LegalAnalyzer:
             assessment["complexity"] = "Medium"
         
         # Identify key topics
-        topics = {
-            "payment": ["payment", "fee", "salary", "compensation", "amount"],
-            "termination": ["termination", "terminate", "cancel"],
-            "confidentiality": ["confidential", "nda", "non-disclosure"],
-            "liability": ["liability", "indemnify", "damages"],
-            "ip": ["intellectual property", "copyright", "patent"],
-            "non-compete": ["non-compete", "compete", "competitive"]
-        }
-        
-        for topic, keywords in topics.items():
+        for topic, keywords in self.QUICK_TOPICS.items():
             if any(kw in text_lower for kw in keywords):
                 assessment["key_topics"].append(topic)
         
@@ -274,7 +664,7 @@ class LegalAnalyzer:
             assessment["quick_flags"].append("Unlimited liability mentioned")
         if "sole discretion" in text_lower:
             assessment["quick_flags"].append("Broad discretionary powers")
-        if "waive" in text_lower or "waiver" in text_lower:
+        if "waive" in text_lower:  # also covers "waiver"
             assessment["quick_flags"].append("Waiver clauses present")
         
         return assessment
@@ -11,7 +11,9 @@ class PromptTemplates:
     Collection of prompt templates for legal document analysis
     """
     
-    # System prompt for legal analysis
+    # System prompt for legal analysis. It is sent first on every call and
+    # never formatted per request, and the reference guide keeps it above
+    # OpenAI's 1024-token minimum, so all calls share a cached prefix.
     SYSTEM_PROMPT = """You are an expert legal advisor specializing in Indian contract law and commercial agreements. Your role is to:
 
 1. Analyze contracts for small and medium businesses (SMEs) in India
@@ -27,7 +29,45 @@ Important guidelines:
 - When suggesting changes, be practical and consider business realities
 - Reference Indian laws (Contract Act, Companies Act, etc.) when relevant
 
-DO NOT provide definitive legal advice. Always recommend consulting a qualified lawyer for important decisions."""
+DO NOT provide definitive legal advice. Always recommend consulting a qualified lawyer for important decisions.
+
+REFERENCE GUIDE (use when classifying and assessing contracts):
+
+Contract types: Employment Agreement, Vendor Contract, Lease Agreement, Partnership Deed, Service Contract, Non-Disclosure Agreement, Consulting Agreement, Licensing Agreement, Other.
+
+Risk scale: LOW = 1-3 (standard, balanced terms), MEDIUM = 4-6 (one-sided or unclear terms worth negotiating), HIGH = 7-10 (terms that can cause serious financial or legal harm to the SME).
+
+High-risk clause categories and the wording that usually signals them:
+- Penalty: "penalty", "liquidated damages", "fine", "forfeit". Under Section 74 of the Indian Contract Act, 1872 a court awards only reasonable compensation up to the stated amount, so flag amounts that are out of proportion to the likely loss.
+- Indemnity: "indemnify", "indemnification", "hold harmless", "defend". Sections 124-125 of the Contract Act govern indemnity. One-sided or uncapped indemnities, or indemnities covering the other party's own negligence, are high risk.
+- Termination: "terminate", "termination", "cancel", "rescind". Check whether both parties have equal rights, the notice period, termination for convenience, cure periods for breach, and what is payable on exit.
+- Non-compete: "non-compete", "non compete", "restraint of trade", "compete". Section 27 of the Contract Act makes agreements in restraint of trade void, so post-termination non-competes are generally unenforceable in India (sale of goodwill is the main exception), although restrictions during the term and reasonable non-solicitation clauses are usually upheld.
+- IP transfer: "intellectual property", "IP rights", "patent", "copyright", "trademark", "assign all rights". Under Section 19 of the Copyright Act, 1957 an assignment must be in writing; if no period is stated it is deemed to be five years, and if no territory is stated it is deemed to be India. Flag assignments of pre-existing IP and missing licence-back rights.
+- Auto-renewal: "auto-renew", "automatic renewal", "auto renewal", "evergreen". Check the opt-out window, notice requirements and price escalation on renewal.
+- Arbitration: "arbitration", "arbitrator", "dispute resolution". The Arbitration and Conciliation Act, 1996 requires the agreement to be in writing (Section 7); check the seat, the number of arbitrators, who appoints them (unilateral appointment by one party raises independence concerns under Section 12) and who bears the costs.
+- Jurisdiction: "jurisdiction", "governing law", "venue". Courts or a seat far from the SME's place of business, or foreign governing law, raise the cost of enforcing rights.
+- Liability: "unlimited liability", "liability cap", "limitation of liability". Flag unlimited liability for the SME, caps that protect only the other party, and exclusion of indirect or consequential loss on one side only.
+- Confidentiality: "confidential", "NDA", "non-disclosure", "trade secret". Check the definition of confidential information, the standard exclusions, the duration of the obligation and the return or destruction of information.
+
+Other Indian law points that often matter to SMEs:
+- Indian Contract Act, 1872: agreements with an unlawful object or consideration are void (Section 23); clauses that bar a party from enforcing its rights in court or shorten the statutory limitation period are void (Section 28), but arbitration clauses are permitted; compensation for breach is covered by Section 73.
+- MSMED Act, 2006: a buyer must pay a micro or small enterprise supplier within the agreed period, which cannot exceed 45 days from acceptance, failing which compound interest at three times the RBI bank rate is payable. Flag longer payment terms where the SME is the supplier.
+- Indian Stamp Act, 1899 and state stamp laws: an instrument that is not duly stamped cannot be admitted in evidence until the duty and penalty are paid.
+- Registration Act, 1908 and Transfer of Property Act, 1882: leases of immovable property for a term exceeding one year must be registered.
+- Information Technology Act, 2000: contracts formed electronically are valid (Section 10A). Personal data handling should also be checked against the Digital Personal Data Protection Act, 2023.
+- Limitation Act, 1963: the general limitation period for a suit on a contract is three years.
+- Other statutes to reference when relevant: Arbitration and Conciliation Act, Companies Act, Specific Relief Act, GST laws, Income Tax Act, labour codes, and SEBI or RBI regulations for regulated businesses.
+
+When the contract text is provided it follows in a separate message; base every finding on that text and quote the relevant clause where possible."""
+
+    # Contract text sent as its own message ahead of the task prompt. System
+    # prompt + contract form a prefix that is identical across tasks on the
+    # same contract, so the provider's prompt cache can reuse it.
+    CONTRACT_CONTEXT = """CONTRACT TEXT:
+{contract_text}"""
+
+    # Placeholder used inside task prompts when the contract is sent as context
+    CONTRACT_REFERENCE = "[Provided in the previous message]"
 
     # Contract summary prompt
     CONTRACT_SUMMARY = """Analyze the following contract and provide a comprehensive summary:
@@ -63,6 +103,40 @@ Please provide:
 
 Keep the summary clear, concise, and in plain business language."""
 
+    # Merge prompt for summaries of a long contract split into sections
+    SUMMARY_MERGE = """The following are summaries of consecutive sections of a single contract. Combine them into one comprehensive summary of the whole contract:
+
+SECTION SUMMARIES:
+{section_summaries}
+
+Please provide:
+
+1. **Contract Overview**
+   - Type of contract
+   - Parties involved
+   - Main purpose/objective
+
+2. **Key Terms**
+   - Duration/term
+   - Financial terms (amounts, payment schedule)
+   - Key obligations of each party
+
+3. **Important Dates**
+   - Effective date
+   - Expiry/renewal dates
+   - Key milestones
+
+4. **Notable Provisions**
+   - Termination conditions
+   - Confidentiality requirements
+   - Dispute resolution mechanism
+
+5. **Quick Assessment**
+   - Overall complexity (Low/Medium/High)
+   - Recommended action items
+
+Remove repetition between sections and keep the summary clear, concise, and in plain business language."""
+
     # Clause explanation prompt
     CLAUSE_EXPLANATION = """Explain the following contract clause in simple, everyday language:
 
@@ -91,6 +165,19 @@ Please provide:
 
 Keep the explanation under 300 words and use bullet points for clarity."""
 
+    # Several clauses explained in one request; the reply is split on the ITEM markers
+    BATCH_CLAUSE_EXPLANATION = """Explain each of the following {clause_count} contract clauses in simple, everyday language:
+
+{clause_items}
+
+For every clause, reply under a heading line of the form "### ITEM <number>", using the same numbers and order as above, and give:
+
+1. **Plain Language Explanation** - what the clause actually means, for someone with no legal background
+2. **Practical Implications** - how it affects the parties in practice
+3. **Key Points to Note** - the most important aspects and any hidden implications
+
+Keep each explanation under 200 words, use bullet points for clarity, and do not write anything before the first ITEM heading."""
+
     # Risk analysis prompt
     RISK_ANALYSIS = """Analyze the following clause for potential risks:
 
@@ -289,9 +376,25 @@ Low Priority (nice to have):
 Keep language accessible to business owners without legal background."""
 
     @classmethod
-    def get_summary_prompt(cls, contract_text: str) -> str:
-        """Get formatted summary prompt"""
-        return cls.CONTRACT_SUMMARY.format(contract_text=contract_text[:15000])
+    def get_contract_context(cls, contract_text: str, max_chars: int = 15000) -> str:
+        """Get the shared contract-text message used as a cacheable prefix"""
+        return cls.CONTRACT_CONTEXT.format(contract_text=contract_text[:max_chars])
+    
+    @classmethod
+    def get_summary_prompt(cls, contract_text: str, include_text: bool = True) -> str:
+        """Get formatted summary prompt (include_text=False when sent as context)"""
+        return cls.CONTRACT_SUMMARY.format(
+            contract_text=contract_text[:15000] if include_text else cls.CONTRACT_REFERENCE
+        )
+    
+    @classmethod
+    def get_summary_merge_prompt(cls, section_summaries: List[str]) -> str:
+        """Get formatted prompt for merging per-section summaries"""
+        return cls.SUMMARY_MERGE.format(
+            section_summaries="\n\n".join(
+                f"--- Section {i} ---\n{summary}" for i, summary in enumerate(section_summaries, 1)
+            )
+        )
     
     @classmethod
     def get_clause_explanation_prompt(cls, clause_text: str, clause_type: str = "General") -> str:
@@ -301,6 +404,15 @@ Keep language accessible to business owners without legal background."""
             clause_type=clause_type
         )
     
+    @classmethod
+    def get_batch_clause_explanation_prompt(cls, clauses: List[Dict[str, str]]) -> str:
+        """Get formatted prompt explaining several {"text", "type"} clauses at once"""
+        items = "\n\n".join(
+            f"### ITEM {i}\nCLAUSE TYPE: {clause.get('type', 'General')}\nCLAUSE TEXT:\n{clause.get('text', '')[:3000]}"
+            for i, clause in enumerate(clauses, 1)
+        )
+        return cls.BATCH_CLAUSE_EXPLANATION.format(clause_count=len(clauses), clause_items=items)
+    
     @classmethod
     def get_risk_analysis_prompt(cls, clause_text: str, clause_type: str = "General", 
                                   risk_indicators: List[str] = None) -> str:
@@ -329,19 +441,21 @@ Keep language accessible to business owners without legal background."""
         return cls.HINDI_TRANSLATION.format(hindi_text=hindi_text[:5000])
     
     @classmethod
-    def get_compliance_prompt(cls, contract_text: str, contract_type: str = "General") -> str:
-        """Get formatted compliance check prompt"""
+    def get_compliance_prompt(cls, contract_text: str, contract_type: str = "General",
+                              include_text: bool = True) -> str:
+        """Get formatted compliance check prompt (include_text=False when sent as context)"""
         return cls.COMPLIANCE_CHECK.format(
-            contract_text=contract_text[:15000],
+            contract_text=contract_text[:15000] if include_text else cls.CONTRACT_REFERENCE,
             contract_type=contract_type
         )
     
     @classmethod
     def get_full_analysis_prompt(cls, contract_text: str, contract_type: str = "Unknown",
-                                  parties: List[str] = None, key_terms: List[str] = None) -> str:
-        """Get formatted full analysis prompt"""
+                                  parties: List[str] = None, key_terms: List[str] = None,
+                                  include_text: bool = True) -> str:
+        """Get formatted full analysis prompt (include_text=False when sent as context)"""
         return cls.FULL_ANALYSIS.format(
-            contract_text=contract_text[:20000],
+            contract_text=contract_text[:20000] if include_text else cls.CONTRACT_REFERENCE,
             contract_type=contract_type,
             parties=", ".join(parties) if parties else "Not extracted",
             key_terms=", ".join(key_terms) if key_terms else "Not extracted"
@@ -355,7 +469,9 @@ if __name__ == "__main__":
     print("\nAvailable prompts:")
     print("- SYSTEM_PROMPT")
     print("- CONTRACT_SUMMARY")
+    print("- SUMMARY_MERGE")
     print("- CLAUSE_EXPLANATION")
+    print("- BATCH_CLAUSE_EXPLANATION")
     print("- RISK_ANALYSIS")
     print("- RENEGOTIATION_SUGGESTIONS")
     print("- HINDI_TRANSLATION")
@@ -0,0 +1,166 @@
+"""
+Response Cache Module
+In-memory cache of LLM responses keyed by normalized prompt text, optionally
+backed by a SQLite file so responses survive restarts
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+# Runs of whitespace, collapsed so reflowed copies of a clause share a key
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with a time-to-live
+    
+    Keys are built from normalized text (case-folded, whitespace collapsed),
+    so boilerplate clauses that differ only in layout or capitalization
+    reuse one LLM response instead of triggering a new API call.
+    
+    With a path, every response is also written to a SQLite file and memory
+    misses fall back to it, so the cache is shared across restarts and
+    processes. Values must then be JSON-serializable.
+    """
+    
+    def __init__(self, max_entries: int = 256, ttl: float = 3600, path: str = None):
+        """
+        Initialize the cache
+        
+        Args:
+            max_entries: Maximum number of responses kept in memory
+            ttl: Seconds a response stays valid
+            path: Optional SQLite file for persistent storage
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = self._open_db(path) if path else None
+    
+    def _open_db(self, path: str) -> sqlite3.Connection:
+        """Open (or create) the SQLite store and drop expired responses"""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        db = sqlite3.connect(path, check_same_thread=False)
+        with db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, stored_at REAL NOT NULL, value TEXT NOT NULL)"
+            )
+            db.execute("DELETE FROM responses WHERE stored_at < ?", (time.time() - self.ttl,))
+        return db
+    
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """
+        Build a cache key from request parts
+        
+        Args:
+            parts: Model, prompt text, limits, ... (None parts are skipped)
+        
+        Returns:
+            SHA-256 hex digest of the normalized parts
+        """
+        normalized = "\x1f".join(
+            _WHITESPACE_RE.sub(" ", str(part)).strip().casefold()
+            for part in parts if part is not None
+        )
+        return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return self._get_from_db(key)
+            
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            
+            self._entries.move_to_end(key)
+            return value
+    
+    def _get_from_db(self, key: str) -> Optional[Any]:
+        """Load a response from the SQLite store into memory (lock held)"""
+        if self._db is None:
+            return None
+        
+        row = self._db.execute(
+            "SELECT stored_at, value FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        stored_at, data = row
+        age = time.time() - stored_at
+        if age > self.ttl:
+            return None
+        
+        value = json.loads(data)
+        # Keep the original expiry time for the in-memory copy
+        self._remember(key, time.monotonic() - age, value)
+        return value
+    
+    def _remember(self, key: str, stored_at: float, value: Any):
+        """Add an in-memory entry, evicting the least recently used (lock held)"""
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def put(self, key: str, value: Any):
+        """Store a value, evicting the least recently used entry when full"""
+        with self._lock:
+            self._remember(key, time.monotonic(), value)
+            if self._db is not None:
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO responses (key, stored_at, value) VALUES (?, ?, ?)",
+                        (key, time.time(), json.dumps(value))
+                    )
+    
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                with self._db:
+                    self._db.execute("DELETE FROM responses")
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Quick test
+if __name__ == "__main__":
+    cache = ResponseCache(max_entries=2, ttl=60)
+    
+    print("Response Cache Module")
+    print("=" * 50)
+    
+    key = cache.make_key("gpt-4", "The Employee shall keep all information\n  CONFIDENTIAL.")
+    cache.put(key, "cached explanation")
+    
+    same = cache.make_key("gpt-4", "the employee shall keep all information confidential.")
+    print(f"Normalized hit: {cache.get(same)}")
+    print(f"Different model: {cache.get(cache.make_key('gpt-3.5-turbo', 'the employee'))}")
+    print(f"Entries: {len(cache)}")
+    
+    import tempfile
+    path = os.path.join(tempfile.mkdtemp(), "llm_cache.sqlite3")
+    ResponseCache(path=path).put(key, {"content": "persisted explanation"})
+    print(f"After restart: {ResponseCache(path=path).get(key)}")
@@ -3,6 +3,13 @@ UI module for Contract Analysis & Risk Assessment Bot
 """
 
 from .components import UIComponents
-from .pdf_exporter import PDFExporter
 
 __all__ = ["UIComponents", "PDFExporter"]
+
+
+def __getattr__(name):
+    """Import the fpdf2-backed PDFExporter only when it is first requested"""
+    if name == "PDFExporter":
+        from .pdf_exporter import PDFExporter
+        return PDFExporter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,6 +3,7 @@ UI Components Module
 Streamlit UI components for the contract analysis application
 """
 
+import html
 import streamlit as st
 from typing import Dict, List, Any, Optional
 
@@ -30,6 +31,62 @@ class UIComponents:
         'CRITICAL': '#9b59b6'
     }
     
+    # Clause risk indicators that mark a clause card as high risk
+    HIGH_RISK_INDICATORS = frozenset({'unlimited_liability', 'one_sided_indemnity', 'unilateral_termination'})
+    
+    # Styles for render_risk_distribution. They go out in the same element as
+    # the bar: Streamlit drops elements that are not re-emitted on a rerun,
+    # so styles cannot be injected once per session
+    RISK_BAR_CSS = """
+        <style>
+        .risk-bar {
+            display: flex;
+            height: 30px;
+            border-radius: 5px;
+            overflow: hidden;
+            margin: 1rem 0;
+        }
+        .risk-segment {
+            display: flex;
+            align-items: center;
+            justify-content: center;
+            color: white;
+            font-weight: bold;
+            font-size: 0.8rem;
+        }
+        </style>"""
+    
+    # Finding card markup, filled with %-formatting by _finding_card_html:
+    # color, color, risk type, color, level, score, description, extras
+    FINDING_CARD_TEMPLATE = """
+        <div style="
+            background: white;
+            border: 1px solid #ddd;
+            border-left: 4px solid %s;
+            border-radius: 5px;
+            padding: 1rem;
+            margin: 0.5rem 0;
+        ">
+            <div style="display: flex; justify-content: space-between; align-items: center;">
+                <h4 style="margin: 0; color: %s;">%s</h4>
+                <span style="
+                    background: %s;
+                    color: white;
+                    padding: 0.2rem 0.5rem;
+                    border-radius: 3px;
+                    font-size: 0.8rem;
+                ">%s (%s/10)</span>
+            </div>
+            <p style="margin: 0.5rem 0; color: #555;">%s</p>%s
+        </div>
+        """
+    
+    FINDING_SUGGESTION_TEMPLATE = """
+            <p style="margin: 0.5rem 0; padding: 0.5rem; background: #e8f4fd; border-radius: 3px;">💡 <strong>Suggestion:</strong> %s</p>"""
+    
+    FINDING_LAW_TEMPLATE = """
+            <p style="margin: 0; font-size: 0.8rem; color: #7f8c8d;">📚 <strong>Indian Law Reference:</strong> %s</p>"""
+    
     @staticmethod
     def render_header():
         """Render application header"""
@@ -97,27 +154,7 @@ class UIComponents:
         if total == 0:
             total = 1  # Avoid division by zero
         
-        st.markdown("""
-        <style>
-        .risk-bar {
-            display: flex;
-            height: 30px;
-            border-radius: 5px;
-            overflow: hidden;
-            margin: 1rem 0;
-        }
-        .risk-segment {
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: white;
-            font-weight: bold;
-            font-size: 0.8rem;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-        
-        st.markdown(f"""
+        st.markdown(UIComponents.RISK_BAR_CSS + f"""
         <div class="risk-bar">
             <div class="risk-segment" style="width: {high/total*100}%; background: #e74c3c;">
                 {high if high > 0 else ''}
@@ -147,8 +184,7 @@ class UIComponents:
         
         # Determine risk level for styling
         if risk_indicators:
-            risk_level = 'HIGH' if any(r in ['unlimited_liability', 'one_sided_indemnity', 'unilateral_termination'] 
-                                       for r in risk_indicators) else 'MEDIUM'
+            risk_level = 'MEDIUM' if UIComponents.HIGH_RISK_INDICATORS.isdisjoint(risk_indicators) else 'HIGH'
             border_color = UIComponents.RISK_COLORS[risk_level]
         else:
             border_color = UIComponents.RISK_COLORS['LOW']
@@ -175,6 +211,17 @@ class UIComponents:
     @staticmethod
     def render_finding_card(finding: Dict):
         """Render a risk finding card"""
+        UIComponents.render_findings_bulk([finding])
+    
+    @staticmethod
+    def render_findings_bulk(findings: List[Dict]):
+        """Render many risk finding cards as a single Streamlit element"""
+        if findings:
+            st.markdown("".join(map(UIComponents._finding_card_html, findings)), unsafe_allow_html=True)
+    
+    @staticmethod
+    def _finding_card_html(finding: Dict) -> str:
+        """Build the HTML for one risk finding card"""
         risk_type = finding.get('risk_type', 'Unknown Risk')
         risk_level = finding.get('risk_level', 'MEDIUM')
         if hasattr(risk_level, 'value'):
@@ -184,36 +231,23 @@ class UIComponents:
         suggestion = finding.get('suggestion', '')
         indian_law = finding.get('indian_law_reference', '')
         
+        # Findings carry contract text and LLM output; escape before embedding
+        risk_type, risk_level, description, suggestion, indian_law = (
+            html.escape(str(v)) if v else ""
+            for v in (risk_type, risk_level, description, suggestion, indian_law)
+        )
+        score = html.escape(str(score))
         color = UIComponents.RISK_COLORS.get(risk_level, '#95a5a6')
         
-        st.markdown(f"""
-        <div style="
-            background: white;
-            border: 1px solid #ddd;
-            border-left: 4px solid {color};
-            border-radius: 5px;
-            padding: 1rem;
-            margin: 0.5rem 0;
-        ">
-            <div style="display: flex; justify-content: space-between; align-items: center;">
-                <h4 style="margin: 0; color: {color};">{risk_type}</h4>
-                <span style="
-                    background: {color};
-                    color: white;
-                    padding: 0.2rem 0.5rem;
-                    border-radius: 3px;
-                    font-size: 0.8rem;
-                ">{risk_level} ({score}/10)</span>
-            </div>
-            <p style="margin: 0.5rem 0; color: #555;">{description}</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
+        extras = ""
         if suggestion:
-            st.info(f"💡 **Suggestion:** {suggestion}")
-        
+            extras += UIComponents.FINDING_SUGGESTION_TEMPLATE % suggestion
         if indian_law:
-            st.caption(f"📚 **Indian Law Reference:** {indian_law}")
+            extras += UIComponents.FINDING_LAW_TEMPLATE % indian_law
+        
+        return UIComponents.FINDING_CARD_TEMPLATE % (
+            color, color, risk_type, color, risk_level, score, description, extras
+        )
     
     @staticmethod
     def render_contract_summary(summary: Dict):
@@ -3,6 +3,8 @@ PDF Exporter Module
 Generates professional PDF reports from contract analysis
 """
 
+from functools import lru_cache
+from itertools import islice
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from pathlib import Path
@@ -15,6 +17,36 @@ except ImportError:
     FPDF_AVAILABLE = False
 
 
+def _latin1_safe(text: str) -> str:
+    """Replace characters the core PDF fonts cannot encode with '?'"""
+    # Most report text is plain ASCII, which needs no transcoding (or caching)
+    if text.isascii():
+        return text
+    return _latin1_transcode(text)
+
+
+@lru_cache(maxsize=4096)
+def _latin1_transcode(text: str) -> str:
+    """Round-trip text through latin-1, replacing what it cannot encode"""
+    return text.encode('latin-1', 'replace').decode('latin-1')
+
+
+# Finding fields shown in the report, with their defaults
+_FINDING_DEFAULTS = {
+    'risk_type': 'Unknown',
+    'risk_level': 'MEDIUM',
+    'description': '',
+    'suggestion': ''
+}
+
+
+def _finding_fields(finding: Any) -> Dict[str, Any]:
+    """Read the report's fields from a RiskFinding or a plain finding dict"""
+    if isinstance(finding, dict):
+        return {key: finding.get(key, default) for key, default in _FINDING_DEFAULTS.items()}
+    return {key: getattr(finding, key, default) for key, default in _FINDING_DEFAULTS.items()}
+
+
 class ContractReportPDF(FPDF):
     """
     Custom PDF class for contract analysis reports
@@ -60,7 +92,7 @@ class ContractReportPDF(FPDF):
         self.set_font('Helvetica', '', 10)
         self.set_text_color(0, 0, 0)
         # Handle encoding issues
-        safe_text = text.encode('latin-1', 'replace').decode('latin-1')
+        safe_text = _latin1_safe(text)
         self.multi_cell(0, 5, safe_text)
         self.ln(2)
     
@@ -102,21 +134,28 @@ class ContractReportPDF(FPDF):
         self.set_font('Helvetica', '', 9)
         self.set_text_color(0, 0, 0)
         
-        for row_idx, row in enumerate(data):
+        # Truncate and sanitize every cell up front, so the loop below only
+        # writes cells
+        safe_rows = [[_latin1_safe(self._truncate_cell(str(cell))) for cell in row] for row in data]
+        
+        cell = self.cell
+        for row_idx, row in enumerate(safe_rows):
             # Alternate row colors
             if row_idx % 2 == 0:
                 self.set_fill_color(245, 245, 245)
             else:
                 self.set_fill_color(255, 255, 255)
             
-            for i, cell in enumerate(row):
-                # Truncate long text
-                cell_text = str(cell)[:50] + '...' if len(str(cell)) > 50 else str(cell)
-                safe_text = cell_text.encode('latin-1', 'replace').decode('latin-1')
-                self.cell(col_widths[i], 6, safe_text, 1, 0, 'L', True)
+            for width, text in zip(col_widths, row):
+                cell(width, 6, text, 1, 0, 'L', True)
             self.ln()
         
         self.ln(5)
+    
+    @staticmethod
+    def _truncate_cell(text: str, limit: int = 50) -> str:
+        """Shorten table cell text to limit characters plus an ellipsis"""
+        return text[:limit] + '...' if len(text) > limit else text
 
 
 class PDFExporter:
@@ -161,141 +200,7 @@ class PDFExporter:
             return None
         
         try:
-            pdf = ContractReportPDF()
-            pdf.alias_nb_pages()
-            pdf.add_page()
-            
-            # Title page info
-            pdf.set_font('Helvetica', 'B', 20)
-            pdf.set_text_color(44, 62, 80)
-            pdf.cell(0, 20, 'Contract Analysis Report', 0, 1, 'C')
-            
-            pdf.set_font('Helvetica', '', 12)
-            pdf.set_text_color(127, 140, 141)
-            pdf.cell(0, 10, f'Generated: {datetime.now().strftime("%B %d, %Y at %H:%M")}', 0, 1, 'C')
-            pdf.ln(10)
-            
-            # Contract Summary Section
-            pdf.chapter_title('1. Contract Summary')
-            
-            if contract_summary:
-                summary_data = [
-                    ['Contract Type', contract_summary.get('contract_type', 'Unknown')],
-                    ['Parties', ', '.join(contract_summary.get('parties', [])[:3]) or 'Not identified'],
-                    ['Word Count', str(contract_summary.get('word_count', 'N/A'))],
-                    ['Language', contract_summary.get('language', 'English')]
-                ]
-                
-                for item in summary_data:
-                    pdf.set_font('Helvetica', 'B', 10)
-                    pdf.cell(50, 6, item[0] + ':', 0, 0)
-                    pdf.set_font('Helvetica', '', 10)
-                    safe_value = item[1].encode('latin-1', 'replace').decode('latin-1')
-                    pdf.cell(0, 6, safe_value, 0, 1)
-                
-                pdf.ln(5)
-            
-            # Risk Assessment Section
-            pdf.chapter_title('2. Risk Assessment')
-            
-            if risk_report:
-                # Overall score
-                score = risk_report.get('overall_score', 0)
-                level = risk_report.get('overall_level', 'LOW')
-                if hasattr(level, 'value'):
-                    level = level.value
-                
-                pdf.section_title('Overall Risk')
-                pdf.set_font('Helvetica', 'B', 16)
-                pdf.cell(30, 10, f'{score}/10', 0, 0)
-                pdf.add_risk_badge(level)
-                
-                # Risk summary
-                pdf.body_text(risk_report.get('summary', 'No summary available.'))
-                
-                # Risk counts
-                pdf.section_title('Risk Distribution')
-                risk_data = [
-                    ['High Risk', str(risk_report.get('high_risk_count', 0))],
-                    ['Medium Risk', str(risk_report.get('medium_risk_count', 0))],
-                    ['Low Risk', str(risk_report.get('low_risk_count', 0))]
-                ]
-                pdf.add_table(['Category', 'Count'], risk_data, [100, 90])
-                
-                # Top findings
-                findings = risk_report.get('findings', [])
-                if findings:
-                    pdf.section_title('Key Findings')
-                    
-                    for i, finding in enumerate(findings[:5]):
-                        risk_type = finding.risk_type if hasattr(finding, 'risk_type') else finding.get('risk_type', 'Unknown')
-                        risk_level = finding.risk_level if hasattr(finding, 'risk_level') else finding.get('risk_level', 'MEDIUM')
-                        if hasattr(risk_level, 'value'):
-                            risk_level = risk_level.value
-                        description = finding.description if hasattr(finding, 'description') else finding.get('description', '')
-                        suggestion = finding.suggestion if hasattr(finding, 'suggestion') else finding.get('suggestion', '')
-                        
-                        pdf.set_font('Helvetica', 'B', 10)
-                        pdf.cell(0, 6, f'{i+1}. {risk_type} [{risk_level}]', 0, 1)
-                        pdf.set_font('Helvetica', '', 9)
-                        pdf.body_text(f'Issue: {description}')
-                        if suggestion:
-                            pdf.set_font('Helvetica', 'I', 9)
-                            pdf.body_text(f'Suggestion: {suggestion}')
-                        pdf.ln(3)
-            
-            # Clause Analysis Section
-            if clauses:
-                pdf.add_page()
-                pdf.chapter_title('3. Clause Analysis')
-                
-                for i, clause in enumerate(clauses[:10]):  # Limit to 10 clauses
-                    clause_id = clause.get('clause_id', clause.get('number', f'{i+1}'))
-                    title = clause.get('title', 'Untitled')
-                    category = clause.get('category', 'general')
-                    content = clause.get('content', '')[:200]
-                    
-                    safe_title = title.encode('latin-1', 'replace').decode('latin-1')
-                    pdf.section_title(f'Clause {clause_id}: {safe_title}')
-                    
-                    pdf.set_font('Helvetica', 'I', 9)
-                    pdf.cell(0, 5, f'Category: {category}', 0, 1)
-                    
-                    pdf.set_font('Helvetica', '', 9)
-                    safe_content = content.encode('latin-1', 'replace').decode('latin-1')
-                    pdf.multi_cell(0, 5, safe_content + '...')
-                    pdf.ln(5)
-            
-            # LLM Analysis Section
-            if llm_analysis:
-                pdf.add_page()
-                pdf.chapter_title('4. AI-Powered Analysis')
-                pdf.body_text(llm_analysis[:5000])  # Limit length
-            
-            # Recommendations Section
-            pdf.add_page()
-            pdf.chapter_title('5. Recommendations')
-            
-            recommendations = [
-                'Review all HIGH and CRITICAL risk clauses with legal counsel',
-                'Consider renegotiating unfavorable terms before signing',
-                'Ensure all parties are correctly identified',
-                'Verify jurisdiction and dispute resolution terms',
-                'Check for any missing standard clauses (confidentiality, liability cap)'
-            ]
-            
-            for i, rec in enumerate(recommendations):
-                pdf.set_font('Helvetica', '', 10)
-                pdf.cell(0, 6, f'{i+1}. {rec}', 0, 1)
-            
-            # Disclaimer
-            pdf.ln(10)
-            pdf.set_font('Helvetica', 'I', 8)
-            pdf.set_text_color(127, 140, 141)
-            pdf.multi_cell(0, 4, 
-                'DISCLAIMER: This report is generated by an AI-powered tool and is intended for '
-                'informational purposes only. It does not constitute legal advice. Please consult '
-                'a qualified legal professional before making any decisions based on this analysis.')
+            pdf = self._build_report(contract_summary, risk_report, clauses, llm_analysis)
             
             # Save PDF
             if not filename:
@@ -311,6 +216,176 @@ class PDFExporter:
             print(f"Error generating PDF: {e}")
             return None
     
+    def generate_report_bytes(self,
+                              contract_summary: Dict,
+                              risk_report: Dict,
+                              clauses: List[Dict],
+                              llm_analysis: str = None) -> Optional[bytes]:
+        """
+        Generate the PDF report in memory (e.g. for st.download_button)
+        
+        Args:
+            contract_summary: Contract summary data
+            risk_report: Risk assessment results
+            clauses: Extracted clauses
+            llm_analysis: LLM-generated analysis
+            
+        Returns:
+            PDF content as bytes or None if failed
+        """
+        if not FPDF_AVAILABLE:
+            return None
+        
+        try:
+            pdf = self._build_report(contract_summary, risk_report, clauses, llm_analysis)
+            # fpdf2 returns the document as a bytearray when no name is given
+            return bytes(pdf.output())
+            
+        except Exception as e:
+            print(f"Error generating PDF: {e}")
+            return None
+    
+    def _build_report(self,
+                      contract_summary: Dict,
+                      risk_report: Dict,
+                      clauses: List[Dict],
+                      llm_analysis: str = None) -> ContractReportPDF:
+        """Lay out the full report and return the unsaved PDF document"""
+        pdf = ContractReportPDF()
+        pdf.alias_nb_pages()
+        pdf.add_page()
+        
+        # Title page info
+        pdf.set_font('Helvetica', 'B', 20)
+        pdf.set_text_color(44, 62, 80)
+        pdf.cell(0, 20, 'Contract Analysis Report', 0, 1, 'C')
+        
+        pdf.set_font('Helvetica', '', 12)
+        pdf.set_text_color(127, 140, 141)
+        pdf.cell(0, 10, f'Generated: {datetime.now().strftime("%B %d, %Y at %H:%M")}', 0, 1, 'C')
+        pdf.ln(10)
+        
+        # Contract Summary Section
+        pdf.chapter_title('1. Contract Summary')
+        
+        if contract_summary:
+            summary_data = [
+                ['Contract Type', contract_summary.get('contract_type', 'Unknown')],
+                ['Parties', ', '.join(contract_summary.get('parties', [])[:3]) or 'Not identified'],
+                ['Word Count', str(contract_summary.get('word_count', 'N/A'))],
+                ['Language', contract_summary.get('language', 'English')]
+            ]
+            
+            for item in summary_data:
+                pdf.set_font('Helvetica', 'B', 10)
+                pdf.cell(50, 6, item[0] + ':', 0, 0)
+                pdf.set_font('Helvetica', '', 10)
+                safe_value = _latin1_safe(item[1])
+                pdf.cell(0, 6, safe_value, 0, 1)
+            
+            pdf.ln(5)
+        
+        # Risk Assessment Section
+        pdf.chapter_title('2. Risk Assessment')
+        
+        if risk_report:
+            # Overall score
+            score = risk_report.get('overall_score', 0)
+            level = risk_report.get('overall_level', 'LOW')
+            if hasattr(level, 'value'):
+                level = level.value
+            
+            pdf.section_title('Overall Risk')
+            pdf.set_font('Helvetica', 'B', 16)
+            pdf.cell(30, 10, f'{score}/10', 0, 0)
+            pdf.add_risk_badge(level)
+            
+            # Risk summary
+            pdf.body_text(risk_report.get('summary', 'No summary available.'))
+            
+            # Risk counts
+            pdf.section_title('Risk Distribution')
+            risk_data = [
+                ['High Risk', str(risk_report.get('high_risk_count', 0))],
+                ['Medium Risk', str(risk_report.get('medium_risk_count', 0))],
+                ['Low Risk', str(risk_report.get('low_risk_count', 0))]
+            ]
+            pdf.add_table(['Category', 'Count'], risk_data, [100, 90])
+            
+            # Top findings
+            findings = risk_report.get('findings', [])
+            if findings:
+                pdf.section_title('Key Findings')
+                
+                for i, finding in enumerate(map(_finding_fields, islice(findings, 5))):
+                    risk_level = finding['risk_level']
+                    if hasattr(risk_level, 'value'):
+                        risk_level = risk_level.value
+                    
+                    pdf.set_font('Helvetica', 'B', 10)
+                    pdf.cell(0, 6, f"{i+1}. {finding['risk_type']} [{risk_level}]", 0, 1)
+                    pdf.set_font('Helvetica', '', 9)
+                    pdf.body_text(f"Issue: {finding['description']}")
+                    if finding['suggestion']:
+                        pdf.set_font('Helvetica', 'I', 9)
+                        pdf.body_text(f"Suggestion: {finding['suggestion']}")
+                    pdf.ln(3)
+        
+        # Clause Analysis Section
+        if clauses:
+            pdf.add_page()
+            pdf.chapter_title('3. Clause Analysis')
+            
+            for i, clause in enumerate(islice(clauses, 10)):  # Limit to 10 clauses
+                clause_id = clause.get('clause_id', clause.get('number', f'{i+1}'))
+                title = clause.get('title', 'Untitled')
+                category = clause.get('category', 'general')
+                content = clause.get('content', '')[:200]
+                
+                safe_title = _latin1_safe(title)
+                pdf.section_title(f'Clause {clause_id}: {safe_title}')
+                
+                pdf.set_font('Helvetica', 'I', 9)
+                pdf.cell(0, 5, f'Category: {category}', 0, 1)
+                
+                pdf.set_font('Helvetica', '', 9)
+                safe_content = _latin1_safe(content)
+                pdf.multi_cell(0, 5, safe_content + '...')
+                pdf.ln(5)
+        
+        # LLM Analysis Section
+        if llm_analysis:
+            pdf.add_page()
+            pdf.chapter_title('4. AI-Powered Analysis')
+            pdf.body_text(llm_analysis[:5000])  # Limit length
+        
+        # Recommendations Section
+        pdf.add_page()
+        pdf.chapter_title('5. Recommendations')
+        
+        recommendations = [
+            'Review all HIGH and CRITICAL risk clauses with legal counsel',
+            'Consider renegotiating unfavorable terms before signing',
+            'Ensure all parties are correctly identified',
+            'Verify jurisdiction and dispute resolution terms',
+            'Check for any missing standard clauses (confidentiality, liability cap)'
+        ]
+        
+        # One multi_cell for the whole list: one 6mm line per item, as before
+        pdf.set_font('Helvetica', '', 10)
+        pdf.multi_cell(0, 6, '\n'.join(f'{i+1}. {rec}' for i, rec in enumerate(recommendations)))
+        
+        # Disclaimer
+        pdf.ln(10)
+        pdf.set_font('Helvetica', 'I', 8)
+        pdf.set_text_color(127, 140, 141)
+        pdf.multi_cell(0, 4, 
+            'DISCLAIMER: This report is generated by an AI-powered tool and is intended for '
+            'informational purposes only. It does not constitute legal advice. Please consult '
+            'a qualified legal professional before making any decisions based on this analysis.')
+    
+        return pdf
+    
     def generate_simple_report(self, content: str, title: str = "Analysis Report") -> Optional[str]:
         """
         Generate a simple PDF with text content
@@ -331,7 +406,7 @@ class PDFExporter:
             pdf.add_page()
             
             pdf.set_font('Helvetica', 'B', 16)
-            safe_title = title.encode('latin-1', 'replace').decode('latin-1')
+            safe_title = _latin1_safe(title)
             pdf.cell(0, 10, safe_title, 0, 1, 'C')
             pdf.ln(10)
             
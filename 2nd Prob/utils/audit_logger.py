@@ -1,15 +1,30 @@
 """
 Audit Logger Module
-JSON-based audit logging for contract analysis activities
+JSON Lines audit logging for contract analysis activities
 """
 
 import os
 import json
+from collections import Counter
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 from pathlib import Path
 import hashlib
 
+# Fast JSON encoder (optional, pip install orjson)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _dumps_line(entry: Dict[str, Any]) -> bytes:
+    """Serialize one audit entry as a UTF-8 JSON line"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8')
+
 
 class AuditLogger:
     """
@@ -27,8 +42,12 @@ class AuditLogger:
         self.log_dir.mkdir(parents=True, exist_ok=True)
         
         self.session_id = self._generate_session_id()
-        self.session_log_file = self.log_dir / f"session_{self.session_id}.json"
+        # One JSON entry per line, appended as events happen
+        self.session_log_file = self.log_dir / f"session_{self.session_id}.jsonl"
+        # Small summary written by end_session, so list_sessions need not read the log
+        self.session_meta_file = self.log_dir / f"session_{self.session_id}.meta.json"
         self.session_entries: List[Dict] = []
+        self._event_counts: Counter = Counter()
         
         # Initialize session
         self._log_event("session_start", {"message": "Audit session started"})
@@ -42,9 +61,16 @@ class AuditLogger:
         """Get current ISO timestamp"""
         return datetime.now().isoformat()
     
-    def _hash_content(self, content: str) -> str:
-        """Generate SHA-256 hash of content for integrity verification"""
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+    def _hash_content(self, content: Union[str, bytes]) -> str:
+        """
+        Generate SHA-256 hash of content for integrity verification
+        
+        Pass the raw bytes when the caller has them (e.g. an uploaded file)
+        to skip encoding a UTF-8 copy of the text.
+        """
+        if isinstance(content, str):
+            content = content.encode()
+        return hashlib.sha256(content).hexdigest()[:16]
     
     def _log_event(self, event_type: str, data: Dict[str, Any]):
         """
@@ -54,25 +80,43 @@ class AuditLogger:
             event_type: Type of event
             data: Event data
         """
-        entry = {
+        entry = self._make_entry(event_type, data)
+        self.session_entries.append(entry)
+        self._event_counts[event_type] += 1
+        self._append_to_log([entry])
+    
+    def _make_entry(self, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a timestamped audit entry"""
+        return {
             "timestamp": self._get_timestamp(),
             "session_id": self.session_id,
             "event_type": event_type,
             "data": data
         }
+    
+    def log_many(self, events: List[Dict[str, Any]]):
+        """
+        Log several events with a single write of the session log
         
-        self.session_entries.append(entry)
-        self._save_session_log()
+        Args:
+            events: List of {"event_type": str, "data": dict} items
+        """
+        if not events:
+            return
+        
+        entries = [
+            self._make_entry(event["event_type"], event.get("data", {}))
+            for event in events
+        ]
+        self.session_entries.extend(entries)
+        self._event_counts.update(entry["event_type"] for entry in entries)
+        self._append_to_log(entries)
     
-    def _save_session_log(self):
-        """Save session log to file"""
+    def _append_to_log(self, entries: List[Dict[str, Any]]):
+        """Append entries to the session log file, one JSON object per line"""
         try:
-            with open(self.session_log_file, 'w', encoding='utf-8') as f:
-                json.dump({
-                    "session_id": self.session_id,
-                    "start_time": self.session_entries[0]["timestamp"] if self.session_entries else "",
-                    "entries": self.session_entries
-                }, f, indent=2, ensure_ascii=False)
+            with open(self.session_log_file, 'ab') as f:
+                f.write(b"".join(map(_dumps_line, entries)))
         except Exception as e:
             print(f"Error saving audit log: {e}")
     
@@ -218,6 +262,19 @@ class AuditLogger:
             "total_events": len(self.session_entries),
             "summary": summary or {}
         })
+        self._write_session_meta()
+    
+    def _write_session_meta(self):
+        """Write the session's id, start time and event count next to its log"""
+        try:
+            with open(self.session_meta_file, 'w', encoding='utf-8') as f:
+                json.dump({
+                    "session_id": self.session_id,
+                    "start_time": self.session_entries[0]["timestamp"],
+                    "event_count": len(self.session_entries)
+                }, f, ensure_ascii=False)
+        except Exception as e:
+            print(f"Error saving audit log: {e}")
     
     def get_session_summary(self) -> Dict:
         """
@@ -226,15 +283,10 @@ class AuditLogger:
         Returns:
             Dictionary with session statistics
         """
-        event_counts = {}
-        for entry in self.session_entries:
-            event_type = entry["event_type"]
-            event_counts[event_type] = event_counts.get(event_type, 0) + 1
-        
         return {
             "session_id": self.session_id,
             "total_events": len(self.session_entries),
-            "event_counts": event_counts,
+            "event_counts": dict(self._event_counts),
             "start_time": self.session_entries[0]["timestamp"] if self.session_entries else None,
             "log_file": str(self.session_log_file)
         }
@@ -265,20 +317,50 @@ class AuditLogger:
         if not log_path.exists():
             return sessions
         
-        for log_file in log_path.glob("session_*.json"):
+        for log_file in log_path.glob("session_*.json*"):
+            if log_file.name.endswith(".meta.json"):
+                continue
             try:
-                with open(log_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    sessions.append({
-                        "session_id": data.get("session_id"),
-                        "start_time": data.get("start_time"),
-                        "event_count": len(data.get("entries", [])),
-                        "file": str(log_file)
-                    })
+                sessions.append(AuditLogger._read_session_info(log_file))
             except Exception:
                 continue
         
-        return sorted(sessions, key=lambda x: x.get("start_time", ""), reverse=True)
+        return sorted(sessions, key=lambda x: x.get("start_time") or "", reverse=True)
+    
+    @staticmethod
+    def _read_session_info(log_file: Path) -> Dict:
+        """
+        Summarize one session log file
+        
+        Uses the summary end_session wrote when it is at least as new as the
+        log, otherwise reads JSON Lines logs line by line; whole-file .json
+        logs written by earlier versions are still understood.
+        """
+        meta_file = log_file.with_suffix(".meta.json")
+        if log_file.suffix == ".jsonl" and meta_file.exists() \
+                and meta_file.stat().st_mtime >= log_file.stat().st_mtime:
+            with open(meta_file, 'r', encoding='utf-8') as f:
+                return {**json.load(f), "file": str(log_file)}
+        
+        with open(log_file, 'r', encoding='utf-8') as f:
+            if log_file.suffix == ".json":
+                data = json.load(f)
+                return {
+                    "session_id": data.get("session_id"),
+                    "start_time": data.get("start_time"),
+                    "event_count": len(data.get("entries", [])),
+                    "file": str(log_file)
+                }
+            
+            first = json.loads(f.readline() or "{}")
+            event_count = (1 if first else 0) + sum(1 for line in f if line.strip())
+        
+        return {
+            "session_id": first.get("session_id"),
+            "start_time": first.get("timestamp"),
+            "event_count": event_count,
+            "file": str(log_file)
+        }
 
 
 # Quick test
@@ -4,8 +4,27 @@ Handles Hindi language detection, translation, and normalization
 """
 
 import re
+import string
+from functools import cached_property, lru_cache
 from typing import Tuple, Optional
 
+from core.keyword_matcher import KeywordMatcher
+
+# Devanagari block and ASCII letters, used for language detection
+_DEVANAGARI_RE = re.compile(r'[\u0900-\u097F]')
+_LATIN_LETTER_RE = re.compile(r'[a-zA-Z]')
+
+# Maps every Devanagari character to 'H' and every ASCII letter to 'E', so
+# one translate pass gives both script counts
+_SCRIPT_TABLE = str.maketrans({
+    **dict.fromkeys(map(chr, range(0x0900, 0x0980)), 'H'),
+    **dict.fromkeys(string.ascii_letters, 'E')
+})
+
+# Runs of Devanagari / ASCII letters, counted as words by get_bilingual_summary
+_DEVANAGARI_WORD_RE = re.compile(r'[\u0900-\u097F]+')
+_LATIN_WORD_RE = re.compile(r'[a-zA-Z]+')
+
 
 class HindiProcessor:
     """
@@ -74,23 +93,29 @@ class HindiProcessor:
         "अप्रत्याशित": "unforeseen"
     }
     
+    # All legal terms, found in one scan of the text
+    _TERM_MATCHER = KeywordMatcher(HINDI_LEGAL_TERMS)
+    
     # Hindi numerals
     HINDI_NUMERALS = {
         '०': '0', '१': '1', '२': '2', '३': '3', '४': '4',
         '५': '5', '६': '6', '७': '7', '८': '8', '९': '9'
     }
+    _NUMERAL_TABLE = str.maketrans(HINDI_NUMERALS)
     
-    def __init__(self):
-        self.translator = None
-        self._init_translator()
-    
-    def _init_translator(self):
-        """Initialize translator (googletrans as fallback)"""
+    @cached_property
+    def translator(self):
+        """
+        Translator (googletrans as fallback), created on first use
+        
+        Importing googletrans pulls in its HTTP stack, which language
+        detection and term extraction never need.
+        """
         try:
             from googletrans import Translator
-            self.translator = Translator()
+            return Translator()
         except ImportError:
-            self.translator = None
+            return None
     
     def detect_language(self, text: str) -> Tuple[str, float]:
         """
@@ -103,13 +128,15 @@ class HindiProcessor:
         if not text:
             return ("en", 1.0)
         
-        # Count Devanagari characters
-        hindi_pattern = re.compile(r'[\u0900-\u097F]')
-        hindi_chars = len(hindi_pattern.findall(text))
+        # Pure ASCII text has no Devanagari: it is English, with full
+        # confidence unless it has no letters at all
+        if text.isascii():
+            return ("en", 1.0) if _LATIN_LETTER_RE.search(text) else ("en", 0.5)
         
-        # Count ASCII letters
-        english_pattern = re.compile(r'[a-zA-Z]')
-        english_chars = len(english_pattern.findall(text))
+        # Count Devanagari characters and ASCII letters
+        scripts = text.translate(_SCRIPT_TABLE)
+        hindi_chars = scripts.count('H')
+        english_chars = scripts.count('E')
         
         total = hindi_chars + english_chars
         if total == 0:
@@ -126,14 +153,17 @@ class HindiProcessor:
     
     def is_hindi(self, text: str) -> bool:
         """Check if text contains significant Hindi content"""
+        # Without a single Devanagari character the text can only be English;
+        # one regex search settles that without counting every character
+        if not text or text.isascii() or _DEVANAGARI_RE.search(text) is None:
+            return False
+        
         lang, conf = self.detect_language(text)
         return lang in ["hi", "mixed"]
     
     def normalize_numerals(self, text: str) -> str:
         """Convert Hindi numerals to Arabic numerals"""
-        for hindi, arabic in self.HINDI_NUMERALS.items():
-            text = text.replace(hindi, arabic)
-        return text
+        return text.translate(self._NUMERAL_TABLE)
     
     def extract_hindi_terms(self, text: str) -> dict:
         """
@@ -142,13 +172,22 @@ class HindiProcessor:
         Returns:
             Dictionary of found terms and their English meanings
         """
-        found_terms = {}
-        
-        for hindi_term, english_meaning in self.HINDI_LEGAL_TERMS.items():
-            if hindi_term in text:
-                found_terms[hindi_term] = english_meaning
+        return dict(self._extract_terms_cached(text))
+    
+    @classmethod
+    @lru_cache(maxsize=32)
+    def _extract_terms_cached(cls, text: str) -> dict:
+        """Find the legal terms in a text (shared cached result, do not modify)"""
+        found = cls._TERM_MATCHER.find(text)
+        if not found:
+            return {}
         
-        return found_terms
+        # Keep the table's order, as the per-term scan did
+        return {
+            hindi_term: english_meaning
+            for hindi_term, english_meaning in cls.HINDI_LEGAL_TERMS.items()
+            if hindi_term in found
+        }
     
     def translate_to_english(self, text: str) -> Tuple[str, bool]:
         """
@@ -199,6 +238,10 @@ class HindiProcessor:
         Returns:
             Normalized text suitable for NLP
         """
+        # Pure ASCII text has no Hindi numerals or script to handle
+        if text.isascii():
+            return text
+        
         # Normalize numerals
         text = self.normalize_numerals(text)
         
@@ -227,8 +270,8 @@ class HindiProcessor:
         terms = self.extract_hindi_terms(text)
         
         # Count words in each script
-        hindi_words = len(re.findall(r'[\u0900-\u097F]+', text))
-        english_words = len(re.findall(r'[a-zA-Z]+', text))
+        hindi_words = len(_DEVANAGARI_WORD_RE.findall(text))
+        english_words = len(_LATIN_WORD_RE.findall(text))
         
         return {
             "primary_language": lang,